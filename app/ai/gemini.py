@@ -1,14 +1,60 @@
 """Gemini AI provider implementation."""
 
 import asyncio
-import json
-from typing import Any, Dict, List
+import hashlib
+import re
+from typing import Any, Dict, List, Optional
 
 import google.generativeai as genai
+import orjson
+from google.api_core.exceptions import DeadlineExceeded
 
+from ..config import settings
+from ..utils.cache import TTLCache
 from .errors import AIConfigError, AIRequestError, AITimeoutError
 from .provider import AIProvider
-from ..config import settings
+
+# Leading ```/```json and trailing ``` fences around the JSON payload
+_FENCE = re.compile(r"\A```(?:json)?\s*|\s*```\Z")
+
+# Ranking prompt; literal braces are doubled for str.format
+_PROMPT_TMPL = """
+{prompt}
+
+BUYER BRIEF:
+{brief}
+
+AVAILABLE PRODUCTS:
+{products_json}
+
+TASK:
+Rank the products from most relevant to least relevant for the buyer brief.
+For each product, provide:
+1. A clear reason why it matches (or doesn't match) the brief
+2. An optional confidence score (0.0 to 1.0)
+
+Return ONLY a JSON array of ranked products with this exact structure:
+[
+    {{
+        "product_id": "product_123",
+        "reason": "This product matches the brief because...",
+        "score": 0.85
+    }},
+    {{
+        "product_id": "product_456",
+        "reason": "This product partially matches because...",
+        "score": 0.65
+    }}
+]
+
+IMPORTANT:
+- Include ALL products in the response
+- Order from most relevant to least relevant
+- Use the exact product_id values from the input
+- Provide clear, specific reasons
+- Scores are optional (can be null)
+- Return ONLY valid JSON, no other text
+"""
 
 
 class GeminiProvider(AIProvider):
@@ -24,6 +70,10 @@ class GeminiProvider(AIProvider):
 
         genai.configure(api_key=settings.gemini_api_key)
         self.model = genai.GenerativeModel("gemini-1.5-pro")
+        # Validated rankings for repeat (brief, prompt, products) requests
+        self._ranking_cache = TTLCache(
+            ttl_seconds=settings.ai_cache_ttl_seconds, max_entries=1024
+        )
 
     async def rank_products(
         self,
@@ -32,16 +82,24 @@ class GeminiProvider(AIProvider):
         products: List[Dict[str, Any]],
         model_name: str,
         timeout_ms: int,
+        shard_size: Optional[int] = None,
     ) -> List[Dict[str, Any]]:
         """
         Rank products against a buyer brief using Gemini AI.
 
+        Products are split into shards of ``shard_size`` (AI_SHARD_SIZE by
+        default) that are ranked concurrently, bounded by AI_CONCURRENCY, and
+        merged by score.
+
         Args:
             brief: Buyer's brief/requirements
             prompt: AI prompt to use for ranking
             products: List of product dictionaries with AdCP Product fields
             model_name: AI model to use (ignored, uses gemini-1.5-pro)
-            timeout_ms: Request timeout in milliseconds
+            timeout_ms: Deadline in milliseconds for the whole ranking, which
+                also bounds each Gemini call
+            shard_size: Maximum number of products sent per Gemini call
+                (defaults to settings.ai_shard_size)
 
         Returns:
             List of ranked products with reasons and optional scores:
@@ -53,101 +111,140 @@ class GeminiProvider(AIProvider):
             AITimeoutError: If request times out
         """
         try:
-            # Prepare the prompt with products
-            products_json = json.dumps(products, indent=2)
-
-            full_prompt = f"""
-{prompt}
-
-BUYER BRIEF:
-{brief}
-
-AVAILABLE PRODUCTS:
-{products_json}
-
-TASK:
-Rank the products from most relevant to least relevant for the buyer brief.
-For each product, provide:
-1. A clear reason why it matches (or doesn't match) the brief
-2. An optional confidence score (0.0 to 1.0)
-
-Return ONLY a JSON array of ranked products with this exact structure:
-[
-    {{
-        "product_id": "product_123",
-        "reason": "This product matches the brief because...",
-        "score": 0.85
-    }},
-    {{
-        "product_id": "product_456", 
-        "reason": "This product partially matches because...",
-        "score": 0.65
-    }}
-]
-
-IMPORTANT:
-- Include ALL products in the response
-- Order from most relevant to least relevant
-- Use the exact product_id values from the input
-- Provide clear, specific reasons
-- Scores are optional (can be null)
-- Return ONLY valid JSON, no other text
-"""
-
-            # Run the AI request with timeout
-            response = await asyncio.wait_for(
-                self._generate_content(full_prompt), timeout=timeout_ms / 1000.0
-            )
-
-            # Parse the response
+            cache_key = _ranking_cache_key(brief, prompt, products)
+            cached = self._ranking_cache.get(cache_key)
+            if cached is not None:
+                return [dict(item) for item in cached]
+
+            shard_size = shard_size or settings.ai_shard_size
+            shards = [
+                products[i : i + shard_size]
+                for i in range(0, len(products), shard_size)
+            ] or [products]
+            semaphore = asyncio.Semaphore(settings.ai_concurrency)
+
+            async def rank_with_semaphore(shard: List[Dict[str, Any]]):
+                async with semaphore:
+                    return await self._rank_shard(brief, prompt, shard, timeout_ms)
+
+            # Structured fan-out: a failing shard cancels its siblings instead
+            # of leaving them to burn quota (asyncio.TaskGroup needs Py 3.11)
+            tasks = [
+                asyncio.ensure_future(rank_with_semaphore(shard)) for shard in shards
+            ]
+            # timeout_ms bounds the whole ranking, not each call: with more shards
+            # than AI_CONCURRENCY the calls run in waves
             try:
-                # Clean the response - remove markdown code blocks if present
-                cleaned_response = response.strip()
-                if cleaned_response.startswith('```json'):
-                    cleaned_response = cleaned_response[7:]  # Remove ```json
-                if cleaned_response.startswith('```'):
-                    cleaned_response = cleaned_response[3:]  # Remove ```
-                if cleaned_response.endswith('```'):
-                    cleaned_response = cleaned_response[:-3]  # Remove trailing ```
-                cleaned_response = cleaned_response.strip()
-                
-                ranked_products = json.loads(cleaned_response)
-                if not isinstance(ranked_products, list):
-                    raise AIRequestError("AI response is not a list")
-
-                # Validate each product has required fields
-                for product in ranked_products:
-                    if not isinstance(product, dict):
-                        raise AIRequestError("Product in response is not a dictionary")
-                    if "product_id" not in product:
-                        raise AIRequestError("Product missing product_id field")
-                    if "reason" not in product:
-                        raise AIRequestError("Product missing reason field")
-
-                return ranked_products
-
-            except json.JSONDecodeError as e:
-                raise AIRequestError(f"Failed to parse AI response as JSON: {e}")
-
-        except asyncio.TimeoutError:
-            raise AITimeoutError(f"AI request timed out after {timeout_ms}ms")
+                shard_results = await asyncio.wait_for(
+                    asyncio.gather(*tasks), timeout_ms / 1000.0
+                )
+            except asyncio.TimeoutError as e:
+                raise AITimeoutError(
+                    f"AI request timed out after {timeout_ms}ms"
+                ) from e
+            except BaseException:
+                for task in tasks:
+                    task.cancel()
+                raise
+            ranked_products = [item for result in shard_results for item in result]
+
+            # A single shard keeps the model's native order; shards merge by score
+            if len(shards) > 1:
+                ranked_products.sort(key=_score, reverse=True)
+
+            if settings.ai_cache_ttl_seconds > 0:
+                self._ranking_cache.set(
+                    cache_key, [dict(item) for item in ranked_products]
+                )
+            return ranked_products
+
+        except (AIConfigError, AIRequestError, AITimeoutError):
+            # Already mapped to provider errors
+            raise
         except Exception as e:
             if "API_KEY" in str(e):
-                raise AIConfigError(f"Gemini API key error: {e}")
+                raise AIConfigError(f"Gemini API key error: {e}") from e
             elif "timeout" in str(e).lower():
-                raise AITimeoutError(f"AI request timed out: {e}")
+                raise AITimeoutError(f"AI request timed out: {e}") from e
             else:
-                raise AIRequestError(f"AI request failed: {e}")
+                raise AIRequestError(f"AI request failed: {e}") from e
 
-    async def _generate_content(self, prompt: str) -> str:
-        """Generate content from Gemini with proper error handling."""
+    async def _rank_shard(
+        self,
+        brief: str,
+        prompt: str,
+        products: List[Dict[str, Any]],
+        timeout_ms: int,
+    ) -> List[Dict[str, Any]]:
+        """Rank one shard of products with a single Gemini call."""
+        # Prepare the prompt with products
+        products_json = orjson.dumps(products).decode()
+
+        full_prompt = _PROMPT_TMPL.format(
+            prompt=prompt, brief=brief, products_json=products_json
+        )
+
+        # Run the AI request; the SDK enforces the timeout on the async call
+        response = await self._generate_content(full_prompt, timeout_ms)
+        return _parse_ranking(response)
+
+    async def _generate_content(self, prompt: str, timeout_ms: int) -> str:
+        """Generate content from Gemini without blocking the event loop."""
         try:
-            response = self.model.generate_content(prompt)
+            response = await self.model.generate_content_async(
+                prompt, request_options={"timeout": timeout_ms / 1000.0}
+            )
             return response.text
+        except DeadlineExceeded as e:
+            raise AITimeoutError(f"AI request timed out after {timeout_ms}ms") from e
         except Exception as e:
             if "API_KEY" in str(e):
-                raise AIConfigError(f"Gemini API key error: {e}")
+                raise AIConfigError(f"Gemini API key error: {e}") from e
             elif "quota" in str(e).lower() or "rate" in str(e).lower():
-                raise AIRequestError(f"Gemini rate limit/quota exceeded: {e}")
+                raise AIRequestError(f"Gemini rate limit/quota exceeded: {e}") from e
             else:
-                raise AIRequestError(f"Gemini API error: {e}")
+                raise AIRequestError(f"Gemini API error: {e}") from e
+
+
+def _parse_ranking(response: str) -> List[Dict[str, Any]]:
+    """Parse and validate a Gemini ranking response."""
+    # Clean the response - remove markdown code fences if present
+    cleaned_response = _FENCE.sub("", response.strip())
+
+    try:
+        ranked_products = orjson.loads(cleaned_response)
+    except orjson.JSONDecodeError as e:
+        raise AIRequestError(f"Failed to parse AI response as JSON: {e}") from e
+
+    if not isinstance(ranked_products, list):
+        raise AIRequestError("AI response is not a list")
+
+    # Validate each product has required fields
+    for product in ranked_products:
+        if not isinstance(product, dict):
+            raise AIRequestError("Product in response is not a dictionary")
+        if "product_id" not in product:
+            raise AIRequestError("Product missing product_id field")
+        if "reason" not in product:
+            raise AIRequestError("Product missing reason field")
+
+    return ranked_products
+
+
+def _ranking_cache_key(
+    brief: str, prompt: str, products: List[Dict[str, Any]]
+) -> bytes:
+    """Digest of everything that shapes a ranking, including product content."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(brief.encode())
+    digest.update(b"\0")
+    digest.update(prompt.encode())
+    digest.update(b"\0")
+    digest.update(orjson.dumps(products, option=orjson.OPT_SORT_KEYS))
+    return digest.digest()
+
+
+def _score(item: Dict[str, Any]) -> float:
+    """Sort key for merging shards; missing or non-numeric scores rank last."""
+    score = item.get("score")
+    return float(score) if isinstance(score, (int, float)) else float("-inf")
@@ -1,13 +1,12 @@
 """AI provider abstraction interface."""
 
-from abc import ABC, abstractmethod
-from typing import Any, Dict, List
+from functools import lru_cache
+from typing import Any, Dict, List, Protocol
 
 
-class AIProvider(ABC):
-    """Abstract base class for AI providers."""
+class AIProvider(Protocol):
+    """Structural interface for AI providers (no runtime ABC checks)."""
 
-    @abstractmethod
     async def rank_products(
         self,
         brief: str,
@@ -35,27 +34,17 @@ class AIProvider(ABC):
             AIRequestError: If provider returns non-2xx or invalid response
             AITimeoutError: If request times out
         """
-        pass
+        ...
 
 
-# Provider registry
-_providers: Dict[str, AIProvider] = {}
-
-
-def register_provider(name: str, provider: AIProvider) -> None:
-    """Register an AI provider."""
-    _providers[name] = provider
-
-
-def get_provider(name: str) -> AIProvider:
-    """Get an AI provider by name."""
-    if name not in _providers:
-        raise AIConfigError(
-            f"AI provider '{name}' not found. Available: {list(_providers.keys())}"
-        )
-    return _providers[name]
+@lru_cache(maxsize=None)
+def get_default_provider() -> AIProvider:
+    """Get the default AI provider (Gemini), created once per process.
 
+    Raises:
+        AIConfigError: If GEMINI_API_KEY is not set; nothing is cached then,
+            so a later call can succeed once the key is configured.
+    """
+    from .gemini import GeminiProvider
 
-def get_default_provider() -> AIProvider:
-    """Get the default AI provider (Gemini)."""
-    return get_provider("gemini")
+    return GeminiProvider()
@@ -17,6 +17,9 @@ class Settings:
         self.default_model: str = os.getenv("DEFAULT_MODEL", "gemini-1.5-pro")
         self.port: int = int(os.getenv("PORT", "8000"))
         self.database_url: str = os.getenv("DATABASE_URL", "sqlite:///./adcp_demo.db")
+        # Sync routes run on a 40-thread pool; size the pool so they never queue
+        self.db_pool_size: int = int(os.getenv("DB_POOL_SIZE", "20"))
+        self.db_max_overflow: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
 
         # Orchestrator configuration
         self.orch_timeout_ms_default: int = int(
@@ -25,6 +28,9 @@ class Settings:
         self.orch_concurrency: int = int(os.getenv("ORCH_CONCURRENCY", "8"))
         self.cb_failure_threshold: int = int(os.getenv("CB_FAILURE_THRESHOLD", "3"))
         self.cb_ttl_seconds: int = int(os.getenv("CB_TTL_SECONDS", "60"))
+        self.ai_concurrency: int = int(os.getenv("AI_CONCURRENCY", "4"))
+        self.ai_shard_size: int = int(os.getenv("AI_SHARD_SIZE", "20"))
+        self.ai_cache_ttl_seconds: int = int(os.getenv("AI_CACHE_TTL_SECONDS", "300"))
         self.service_base_url: str = os.getenv(
             "SERVICE_BASE_URL", "http://localhost:8000"
         )
@@ -1,14 +1,23 @@
 """Database configuration and session management."""
 
+import logging
+import threading
 from collections.abc import Generator
 from contextlib import contextmanager
 from pathlib import Path
 
-from sqlalchemy import text
+from sqlalchemy import event, inspect, text
+from sqlalchemy.pool import StaticPool
 from sqlmodel import Session, SQLModel, create_engine
 
 from .config import settings
 
+# Importing the models package registers every table with SQLModel
+from .models import AgentSettings, ExternalAgent, Product, Tenant
+from .utils.fts import ensure_product_fts
+
+logger = logging.getLogger(__name__)
+
 
 def ensure_data_directory():
     """Ensure the data directory exists."""
@@ -16,58 +25,136 @@ def ensure_data_directory():
     data_dir.mkdir(exist_ok=True)
 
 
-def get_engine():
-    """Get database engine from settings with proper configuration."""
+# Process-wide engine, built lazily on first use; the lock keeps threadpool
+# workers racing on first use from each building their own engine and pool
+_engine = None
+_engine_lock = threading.Lock()
+
+# Set once init_db has created the schema for this process
+_initialized = False
+
+# Sent as one script so each new connection pays a single dispatch
+_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL;"
+    "PRAGMA synchronous=NORMAL;"
+    "PRAGMA foreign_keys=ON;"
+    "PRAGMA cache_size=10000;"
+    "PRAGMA temp_store=MEMORY;"
+)
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Apply SQLite PRAGMAs once per new pooled connection."""
+    dbapi_connection.executescript(_SQLITE_PRAGMAS)
+
+
+def _build_engine():
+    """Build the database engine from settings with proper configuration."""
     # Ensure data directory exists
     ensure_data_directory()
 
     # Get database URL with fallback
     db_url = getattr(settings, "database_url", "sqlite:///./data/adcp_demo.sqlite3")
 
-    # Create engine with SQLite-specific configuration
-    engine = create_engine(
-        db_url,
-        echo=False,  # Set to True for SQL debugging
-        connect_args=(
-            {
-                "check_same_thread": False,
-                "timeout": 30.0,
-            }
-            if "sqlite" in db_url
-            else {}
-        ),
-    )
+    engine_kwargs = {
+        "echo": False,  # Set to True for SQL debugging
+        "pool_pre_ping": True,
+    }
+    if "sqlite" in db_url:
+        engine_kwargs["connect_args"] = {
+            "check_same_thread": False,
+            "timeout": 30.0,
+        }
+    # In-memory databases live per connection, so share a single one
+    if "sqlite" in db_url and ":memory:" in db_url:
+        engine_kwargs["poolclass"] = StaticPool
+    else:
+        engine_kwargs.update(
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=30,
+            # Replace connections before server-side idle timeouts close them
+            pool_recycle=1800,
+        )
+
+    engine = create_engine(db_url, **engine_kwargs)
 
     # Set SQLite PRAGMAs for better performance and safety
     if "sqlite" in db_url:
-        with engine.connect() as conn:
-            conn.execute(text("PRAGMA journal_mode=WAL"))
-            conn.execute(text("PRAGMA synchronous=NORMAL"))
-            conn.execute(text("PRAGMA foreign_keys=ON"))
-            conn.execute(text("PRAGMA cache_size=10000"))
-            conn.execute(text("PRAGMA temp_store=MEMORY"))
-            conn.commit()
+        event.listen(engine, "connect", _set_sqlite_pragmas)
 
     return engine
 
 
+def get_engine():
+    """Get the shared database engine, creating it on first call."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = _build_engine()
+    return _engine
+
+
 @contextmanager
 def get_session() -> Generator[Session, None, None]:
     """Context manager for database sessions."""
-    engine = get_engine()
-    with Session(engine) as session:
+    with Session(get_engine()) as session:
         yield session
 
 
+def _drop_duplicate_agent_settings(engine) -> None:
+    """Keep only the newest settings row per tenant before the unique index.
+
+    Databases created before ix_agentsettings_tenant_id could hold several
+    rows for one tenant, which would make CREATE UNIQUE INDEX fail at startup.
+    """
+    index_names = {
+        index["name"] for index in inspect(engine).get_indexes("agentsettings")
+    }
+    if "ix_agentsettings_tenant_id" in index_names:
+        return
+
+    with engine.begin() as conn:
+        deleted = conn.execute(
+            text(
+                "DELETE FROM agentsettings WHERE id NOT IN "
+                "(SELECT MAX(id) FROM agentsettings GROUP BY tenant_id)"
+            )
+        ).rowcount
+    if deleted:
+        logger.warning(
+            f"Removed {deleted} duplicate agent settings rows, keeping the "
+            "newest per tenant, before adding ix_agentsettings_tenant_id"
+        )
+
+
 def init_db():
-    """Initialize database by creating all tables if they don't exist."""
-    # Import all models to ensure they are registered with SQLModel
-    from .models.tenant import Tenant
-    from .models.product import Product
-    from .models.agent_settings import AgentSettings
-    from .models.external_agent import ExternalAgent
+    """Initialize database by creating all tables if they don't exist.
+
+    Runs at most once per process; later calls are no-ops.
+    """
+    global _initialized
+    if _initialized:
+        return
 
     engine = get_engine()
 
     # Only create tables if they don't exist (never drop)
-    SQLModel.metadata.create_all(engine, checkfirst=True)
+    SQLModel.metadata.create_all(
+        engine,
+        tables=[
+            Tenant.__table__,
+            Product.__table__,
+            AgentSettings.__table__,
+            ExternalAgent.__table__,
+        ],
+        checkfirst=True,
+    )
+    _drop_duplicate_agent_settings(engine)
+    # create_all skips indexes on tables that already exist; add any new ones
+    for table in (Product.__table__, AgentSettings.__table__, ExternalAgent.__table__):
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+    ensure_product_fts(engine)
+    _initialized = True
@@ -1,33 +1,43 @@
 """Main FastAPI application for AdCP Demo Orchestrator."""
 
+import os
 import time
-import uuid
+
+import httpx
 from fastapi import FastAPI, Request
-from fastapi.templating import Jinja2Templates
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 
-from .db import get_session, init_db
-from .repositories.tenants import TenantRepository
+from .config import settings
+from .db import init_db
 from .routes import tenant_context, tenant_delete, tenants
-from .routes.products import router as products_router
 from .routes.agent_settings import router as agent_settings_router
-from .routes.orchestrator import router as orchestrator_router
-from .routes.external_agents import router as external_agents_router
 from .routes.buyer import router as buyer_router
+from .routes.external_agents import router as external_agents_router
 from .routes.mcp import router as mcp_router
+from .routes.orchestrator import router as orchestrator_router
 from .routes.preflight import router as preflight_router
-from .utils.cookies import get_active_tenant_id
-from .utils.logging import configure_default_logging, get_logger
-from .config import settings
+from .routes.products import router as products_router
+from .services.navbar_context import load_navbar_context
+from .services.orchestrator import close_agent_client
+from .utils.logging import (
+    configure_default_logging,
+    get_logger,
+    reset_request_id,
+    set_request_id,
+)
+from .utils.templating import templates, warm_templates
 
 # Configure logging
 configure_default_logging(level="INFO" if not settings.debug else "DEBUG")
+logger = get_logger("http")
 
 # Create FastAPI app
 app = FastAPI(
     title="AdCP Demo Orchestrator",
     description="Demo-ready AdCP orchestration that lets a buyer brief fan out to publisher sales agents",
     version="0.1.0",
+    default_response_class=ORJSONResponse,
 )
 
 # Store settings in app state for template access
@@ -36,9 +46,6 @@ app.state.settings = settings
 # Mount static files
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
 
-# Set up Jinja2 templates
-templates = Jinja2Templates(directory="app/templates")
-
 # Include routers
 app.include_router(tenants.router)
 app.include_router(tenant_context.router)
@@ -54,77 +61,55 @@ app.include_router(preflight_router)
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database on startup."""
+    """Initialize database, templates and the shared HTTP client on startup."""
     init_db()
+    warm_templates(templates)
+    # One pooled client for loopback calls so keep-alive connections are reused
+    app.state.http_client = httpx.AsyncClient(
+        base_url=settings.service_base_url,
+        timeout=30.0,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+    )
 
 
-@app.middleware("http")
-async def request_id_middleware(request: Request, call_next):
-    """Add request ID to all requests."""
-    # Generate request ID
-    request_id = str(uuid.uuid4())
-    request.state.request_id = request_id
-
-    # Add to response headers
-    response = await call_next(request)
-    response.headers["X-Request-ID"] = request_id
-
-    return response
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close the shared HTTP clients' pooled connections."""
+    await app.state.http_client.aclose()
+    await close_agent_client()
 
 
 @app.middleware("http")
-async def logging_middleware(request: Request, call_next):
-    """Log request start and end with duration."""
-    start_time = time.time()
-    request_id = getattr(request.state, "request_id", "unknown")
-    logger = get_logger("http", request_id)
+async def request_context_middleware(request: Request, call_next):
+    """Assign a request ID and log request start/end with duration.
 
-    # Log request start
-    logger.info(f"Request started: {request.method} {request.url.path}")
-
-    response = await call_next(request)
-
-    # Calculate duration
-    duration_ms = int((time.time() - start_time) * 1000)
+    A single middleware keeps per-request dispatch to one extra hop. Tenant
+    context is loaded lazily by the pages that render it.
+    """
+    start_time = time.time()
 
-    # Log request end
-    logger.info(
-        f"Request completed: {request.method} {request.url.path} - {response.status_code} ({duration_ms}ms)"
-    )
+    # Generate request ID (opaque 32-char hex, cheaper than formatting a UUID)
+    request_id = os.urandom(16).hex()
+    request.state.request_id = request_id
+    token = set_request_id(request_id)
+    try:
+        # Log request start
+        logger.info(f"Request started: {request.method} {request.url.path}")
 
-    return response
+        response = await call_next(request)
 
+        # Calculate duration
+        duration_ms = int((time.time() - start_time) * 1000)
 
-@app.middleware("http")
-async def tenant_context_middleware(request: Request, call_next):
-    """Add tenant context to request state."""
-    # Get active tenant from cookie
-    tenant_id = get_active_tenant_id(request)
-    active_tenant = None
-    tenants_list = []
+        # Log request end
+        logger.info(
+            f"Request completed: {request.method} {request.url.path} - {response.status_code} ({duration_ms}ms)"
+        )
+    finally:
+        reset_request_id(token)
 
-    try:
-        if tenant_id:
-            # Load active tenant
-            with get_session() as session:
-                repo = TenantRepository(session)
-                active_tenant = repo.get_by_id(tenant_id)
-
-        # Load all tenants for navbar
-        with get_session() as session:
-            repo = TenantRepository(session)
-            tenants_list = repo.list_all()
-    except Exception as e:
-        # If database is not ready, continue without tenant context
-        request_id = getattr(request.state, "request_id", "unknown")
-        logger = get_logger("middleware", request_id)
-        logger.warning(f"Database error in tenant context middleware: {e}")
-
-    # Add to request state
-    request.state.active_tenant = active_tenant
-    request.state.tenants = tenants_list
-
-    response = await call_next(request)
+    # Add to response headers
+    response.headers["X-Request-ID"] = request_id
     return response
 
 
@@ -135,15 +120,15 @@ async def health_check():
 
 
 @app.get("/")
-async def root(request: Request):
+def root(request: Request):
     """Root endpoint serving the main application."""
+    active_tenant, tenants_list = load_navbar_context(request)
     return templates.TemplateResponse(
         "base.html",
         {
             "request": request,
             "title": "AdCP Demo Orchestrator",
-            "active_tenant": getattr(request.state, "active_tenant", None),
-            "tenants": getattr(request.state, "tenants", []),
-            "config": settings,
+            "active_tenant": active_tenant,
+            "tenants": tenants_list,
         },
     )
@@ -2,12 +2,18 @@
 
 from typing import Optional
 
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel
 
 
 class AgentSettings(SQLModel, table=True):
     """Agent settings model for per-tenant AI configuration."""
 
+    # One settings row per tenant; also the conflict target for upserts
+    __table_args__ = (
+        Index("ix_agentsettings_tenant_id", "tenant_id", unique=True),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     tenant_id: int = Field(
         ..., foreign_key="tenant.id", description="Tenant this setting belongs to"
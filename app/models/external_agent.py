@@ -1,15 +1,27 @@
 """External agent model for MCP endpoint configuration."""
 
-import json
 from datetime import datetime
 from typing import Any, Dict, Optional
 
+import orjson
+from sqlalchemy import Index, func, text
 from sqlmodel import Field, SQLModel
 
+from ..utils.timestamps import utc_now
+
 
 class ExternalAgent(SQLModel, table=True):
     """External agent model for MCP endpoint configuration."""
 
+    # Partial index over enabled agents only, in dropdown (name) order
+    __table_args__ = (
+        Index(
+            "ix_externalagent_enabled_name",
+            "name",
+            sqlite_where=text("enabled = 1"),
+        ),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str = Field(..., description="Human-readable agent name")
     base_url: str = Field(..., description="MCP endpoint URL")
@@ -18,18 +30,20 @@ class ExternalAgent(SQLModel, table=True):
         default="{}", description="JSON string of agent capabilities"
     )
     created_at: datetime = Field(
-        default_factory=datetime.utcnow, description="Creation timestamp"
+        default_factory=utc_now,
+        sa_column_kwargs={"server_default": func.now()},
+        description="Creation timestamp",
     )
 
     def get_capabilities(self) -> Dict[str, Any]:
         """Get capabilities as a dictionary."""
         try:
-            return json.loads(self.capabilities)
-        except (json.JSONDecodeError, TypeError):
+            return orjson.loads(self.capabilities)
+        except (orjson.JSONDecodeError, TypeError):
             return {}
 
     def set_capabilities(self, capabilities: Dict[str, Any]) -> None:
         """Set capabilities from a dictionary."""
-        self.capabilities = json.dumps(capabilities)
+        self.capabilities = orjson.dumps(capabilities).decode()
 
     model_config = {"arbitrary_types_allowed": True}
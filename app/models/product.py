@@ -4,12 +4,15 @@ Source: reference/salesagent/src/core/schemas.py
 Fields aligned with AdCP Product schema including nested structures stored as JSON.
 """
 
-import json
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
+import orjson
+from sqlalchemy import Index, func
 from sqlmodel import Field, SQLModel
 
+from ..utils.timestamps import utc_now
+
 
 class Product(SQLModel, table=True):
     """Product model based on AdCP specification.
@@ -21,6 +24,16 @@ class Product(SQLModel, table=True):
     to maintain schema compatibility while keeping the database structure simple.
     """
 
+    # One (tenant_id, sort column, id) index per search_by_tenant sort key, so
+    # tenant-scoped pages are an ordered index range scan instead of scan + sort
+    __table_args__ = (
+        Index("ix_product_tenant_name", "tenant_id", "name", "id"),
+        Index("ix_product_tenant_created", "tenant_id", "created_at", "id"),
+        Index("ix_product_tenant_updated", "tenant_id", "updated_at", "id"),
+        Index("ix_product_tenant_cpm", "tenant_id", "cpm", "id"),
+        Index("ix_product_tenant_delivery", "tenant_id", "delivery_type", "id"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     tenant_id: int = Field(
         ..., foreign_key="tenant.id", description="Tenant this product belongs to"
@@ -72,47 +85,55 @@ class Product(SQLModel, table=True):
 
     # Timestamps
     created_at: datetime = Field(
-        default_factory=datetime.utcnow, description="Creation timestamp"
+        default_factory=utc_now,
+        sa_column_kwargs={"server_default": func.now()},
+        description="Creation timestamp",
     )
     updated_at: datetime = Field(
-        default_factory=datetime.utcnow, description="Last update timestamp"
+        default_factory=utc_now,
+        sa_column_kwargs={"server_default": func.now()},
+        description="Last update timestamp",
     )
 
     def get_formats(self) -> List[Dict[str, Any]]:
         """Get formats as a list of dictionaries."""
         try:
-            return json.loads(self.formats)
-        except (json.JSONDecodeError, TypeError):
+            return orjson.loads(self.formats)
+        except (orjson.JSONDecodeError, TypeError):
             return []
 
     def set_formats(self, formats: List[Dict[str, Any]]) -> None:
         """Set formats from a list of dictionaries."""
-        self.formats = json.dumps(formats)
+        self.formats = orjson.dumps(formats).decode()
 
     def get_price_guidance(self) -> Optional[Dict[str, Any]]:
         """Get price guidance as a dictionary."""
         if not self.price_guidance:
             return None
         try:
-            return json.loads(self.price_guidance)
-        except (json.JSONDecodeError, TypeError):
+            return orjson.loads(self.price_guidance)
+        except (orjson.JSONDecodeError, TypeError):
             return None
 
     def set_price_guidance(self, price_guidance: Optional[Dict[str, Any]]) -> None:
         """Set price guidance from a dictionary."""
-        self.price_guidance = json.dumps(price_guidance) if price_guidance else None
+        self.price_guidance = (
+            orjson.dumps(price_guidance).decode() if price_guidance else None
+        )
 
     def get_implementation_config(self) -> Optional[Dict[str, Any]]:
         """Get implementation config as a dictionary."""
         if not self.implementation_config:
             return None
         try:
-            return json.loads(self.implementation_config)
-        except (json.JSONDecodeError, TypeError):
+            return orjson.loads(self.implementation_config)
+        except (orjson.JSONDecodeError, TypeError):
             return None
 
     def set_implementation_config(self, config: Optional[Dict[str, Any]]) -> None:
         """Set implementation config from a dictionary."""
-        self.implementation_config = json.dumps(config) if config else None
+        self.implementation_config = (
+            orjson.dumps(config).decode() if config else None
+        )
 
     model_config = {"arbitrary_types_allowed": True}
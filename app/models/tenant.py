@@ -3,8 +3,11 @@
 from datetime import datetime
 from typing import Optional
 
+from sqlalchemy import func
 from sqlmodel import Field, SQLModel
 
+from ..utils.timestamps import utc_now
+
 
 class Tenant(SQLModel, table=True):
     """Tenant model for multi-tenancy support."""
@@ -15,10 +18,14 @@ class Tenant(SQLModel, table=True):
         ..., unique=True, index=True, description="URL-safe tenant identifier"
     )
     created_at: datetime = Field(
-        default_factory=datetime.utcnow, description="Creation timestamp"
+        default_factory=utc_now,
+        sa_column_kwargs={"server_default": func.now()},
+        description="Creation timestamp",
     )
     updated_at: datetime = Field(
-        default_factory=datetime.utcnow, description="Last update timestamp"
+        default_factory=utc_now,
+        sa_column_kwargs={"server_default": func.now()},
+        description="Last update timestamp",
     )
 
     model_config = {"arbitrary_types_allowed": True}
@@ -2,6 +2,7 @@
 
 from typing import Optional
 
+from sqlalchemy.dialects.sqlite import insert
 from sqlmodel import Session, select
 
 from ..models.agent_settings import AgentSettings
@@ -19,22 +20,32 @@ class AgentSettingsRepository:
         return self.session.exec(statement).first()
 
     def upsert_for_tenant(self, tenant_id: int, **kwargs) -> AgentSettings:
-        """Create or update agent settings for a tenant."""
-        existing = self.get_by_tenant(tenant_id)
-
-        if existing:
-            # Update existing settings
-            for key, value in kwargs.items():
-                if hasattr(existing, key):
-                    setattr(existing, key, value)
-            self.session.add(existing)
-            self.session.commit()
-            self.session.refresh(existing)
-            return existing
+        """Create or update agent settings for a tenant.
+
+        Runs as a single INSERT ... ON CONFLICT DO UPDATE ... RETURNING, so no
+        lookup beforehand or refresh afterwards. Unknown keys are ignored.
+        """
+        values = {
+            key: value
+            for key, value in kwargs.items()
+            if key in AgentSettings.__table__.c and key not in ("id", "tenant_id")
+        }
+        statement = insert(AgentSettings).values(tenant_id=tenant_id, **values)
+        if values:
+            statement = statement.on_conflict_do_update(
+                index_elements=[AgentSettings.tenant_id], set_=values
+            )
         else:
-            # Create new settings
-            settings = AgentSettings(tenant_id=tenant_id, **kwargs)
-            self.session.add(settings)
-            self.session.commit()
-            self.session.refresh(settings)
-            return settings
+            statement = statement.on_conflict_do_nothing(
+                index_elements=[AgentSettings.tenant_id]
+            )
+        statement = statement.returning(AgentSettings).execution_options(
+            populate_existing=True
+        )
+
+        settings = self.session.exec(statement).scalar_one_or_none()
+        self.session.commit()
+        if settings is None:
+            # Nothing to change on an existing row; DO NOTHING returns no row
+            settings = self.get_by_tenant(tenant_id)
+        return settings
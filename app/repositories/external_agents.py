@@ -3,10 +3,11 @@
 from typing import List, Optional
 
 from fastapi import Depends
+from sqlalchemy import true
 from sqlmodel import Session, select
 
-from ..models.external_agent import ExternalAgent
 from ..deps import get_db_session
+from ..models.external_agent import ExternalAgent
 
 
 class ExternalAgentRepository:
@@ -23,9 +24,8 @@ class ExternalAgentRepository:
         return agent
 
     def get_by_id(self, agent_id: int) -> Optional[ExternalAgent]:
-        """Get external agent by ID."""
-        statement = select(ExternalAgent).where(ExternalAgent.id == agent_id)
-        return self.session.exec(statement).first()
+        """Get external agent by ID, from the session's identity map when loaded."""
+        return self.session.get(ExternalAgent, agent_id)
 
     def list_all(self) -> List[ExternalAgent]:
         """List all external agents."""
@@ -36,7 +36,9 @@ class ExternalAgentRepository:
         """List only enabled external agents."""
         statement = (
             select(ExternalAgent)
-            .where(ExternalAgent.enabled == True)
+            # Literal true() (not a bind param) so the planner can match the
+            # partial index's WHERE enabled = 1
+            .where(ExternalAgent.enabled == true())
             .order_by(ExternalAgent.name)
         )
         return list(self.session.exec(statement))
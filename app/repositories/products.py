@@ -1,10 +1,119 @@
 """Product repository for CRUD operations and search."""
 
-from typing import List, Optional, Tuple
+from datetime import datetime
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
 
+from sqlalchemy import (
+    and_,
+    delete,
+    exists,
+    func,
+    insert,
+    lambda_stmt,
+    literal,
+    or_,
+    tuple_,
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlmodel import Session, select
 
 from ..models.product import Product
+from ..utils.fts import product_fts_enabled, product_fts_matches
+from ..utils.pagination import decode_cursor, encode_cursor
+from ..utils.timestamps import utc_now
+
+# Rows hydrated per batch when streaming a tenant's products
+_STREAM_BATCH_SIZE = 500
+
+# Sort keys accepted by the search methods, mapped to their ORDER BY columns;
+# unknown keys fall back to name so paging order is always deterministic
+DEFAULT_SORT = "name"
+SORT_COLUMNS = {
+    "name": Product.name,
+    "created_at": Product.created_at,
+    "updated_at": Product.updated_at,
+    "cpm": Product.cpm,
+    "delivery_type": Product.delivery_type,
+}
+# Sort columns that may hold NULL, which keyset conditions must allow for
+_NULLABLE_SORTS = frozenset({"cpm"})
+
+
+class DuplicateProductError(Exception):
+    """Raised when creating a product whose product_id is already taken."""
+
+    def __init__(self, product_id: str):
+        super().__init__(f"Product ID '{product_id}' already exists")
+        self.product_id = product_id
+
+
+def _search_filters(tenant_id: int, query: Optional[str], use_fts: bool) -> list:
+    """Build the WHERE clauses shared by the product search methods."""
+    where_clauses = [Product.tenant_id == tenant_id]
+    if query:
+        matches = product_fts_matches(query) if use_fts else None
+        if matches is not None:
+            where_clauses.append(Product.id.in_(matches))
+        else:
+            where_clauses.append(
+                or_(
+                    Product.name.contains(query),
+                    Product.description.contains(query),
+                )
+            )
+    return where_clauses
+
+
+def _resolve_sort(sort: str) -> Tuple[str, Any]:
+    """Return the effective sort name and the column to order by."""
+    if sort not in SORT_COLUMNS:
+        sort = DEFAULT_SORT
+    return sort, SORT_COLUMNS[sort]
+
+
+def _after_position(
+    sort: str, sort_key: Any, last_value: Any, last_id: int, descending: bool
+) -> Any:
+    """Match rows that come after (last_value, last_id) in _order_by's order.
+
+    SQLite sorts NULL before every value, so NULL cpm rows lead ascending
+    pages and trail descending ones. A row-value comparison never matches
+    NULL, so those rows are handled with explicit IS NULL terms.
+    """
+    if last_value is None:
+        if descending:
+            return and_(sort_key.is_(None), Product.id < last_id)
+        return or_(
+            sort_key.is_not(None), and_(sort_key.is_(None), Product.id > last_id)
+        )
+
+    key = tuple_(sort_key, Product.id)
+    # Typed binds so datetimes serialize the way the column stores them
+    position = tuple_(
+        literal(last_value, sort_key.type), literal(last_id, Product.id.type)
+    )
+    if not descending:
+        return key > position
+    if sort in _NULLABLE_SORTS:
+        return or_(key < position, sort_key.is_(None))
+    return key < position
+
+
+def _order_by(sort_key: Any, descending: bool) -> tuple:
+    """Order by the sort key with id as tiebreaker, for a total, stable order.
+
+    Offset and keyset pages share this ordering, so a cursor taken from an
+    offset page continues exactly where that page ended.
+    """
+    if descending:
+        return sort_key.desc(), Product.id.desc()
+    return sort_key.asc(), Product.id.asc()
+
+
+def cursor_after(product: Product, sort: str) -> str:
+    """Encode the keyset position just past ``product`` for the given sort."""
+    sort, _ = _resolve_sort(sort)
+    return encode_cursor(getattr(product, sort), product.id)
 
 
 class ProductRepository:
@@ -14,38 +123,102 @@ class ProductRepository:
         self.session = session
 
     def create(self, product: Product) -> Product:
-        """Create a new product."""
-        self.session.add(product)
+        """Create a new product.
+
+        The unique product_id index decides duplicates in the INSERT itself,
+        so there is no separate existence check to race against.
+
+        Raises:
+            DuplicateProductError: If the product_id is already taken
+        """
+        statement = (
+            sqlite_insert(Product)
+            .values(**product.model_dump(exclude={"id"}))
+            .on_conflict_do_nothing(index_elements=[Product.product_id])
+            .returning(Product.id)
+        )
+        new_id = self.session.exec(statement).scalar_one_or_none()
         self.session.commit()
-        self.session.refresh(product)
+        if new_id is None:
+            raise DuplicateProductError(product.product_id)
+
+        product.id = new_id
         return product
 
     def get_by_id(self, product_id: int) -> Optional[Product]:
-        """Get product by ID."""
-        statement = select(Product).where(Product.id == product_id)
-        return self.session.exec(statement).first()
+        """Get product by ID, from the session's identity map when loaded."""
+        return self.session.get(Product, product_id)
 
     def get_by_product_id(self, product_id: str) -> Optional[Product]:
         """Get product by product_id field."""
-        statement = select(Product).where(Product.product_id == product_id)
-        return self.session.exec(statement).first()
+        # lambda_stmt caches the built statement itself, skipping the select()
+        # construction and cache-key walk on every call of this hot lookup
+        statement = lambda_stmt(
+            lambda: select(Product).where(Product.product_id == product_id)
+        )
+        return self.session.exec(statement).scalars().first()
 
-    def list_by_tenant(self, tenant_id: int) -> List[Product]:
-        """List all products for a tenant."""
-        statement = (
-            select(Product).where(Product.tenant_id == tenant_id).order_by(Product.name)
+    def list_by_tenant(self, tenant_id: int) -> Iterator[Product]:
+        """Stream all products for a tenant, ordered by name.
+
+        Rows are fetched and hydrated in batches of ``_STREAM_BATCH_SIZE`` so a
+        caller that iterates once never holds the whole tenant in memory.
+        """
+        statement = lambda_stmt(
+            lambda: select(Product)
+            .where(Product.tenant_id == tenant_id)
+            .order_by(Product.name)
+        )
+        result = self.session.exec(
+            statement, execution_options={"yield_per": _STREAM_BATCH_SIZE}
         )
-        return list(self.session.exec(statement))
+        yield from result.scalars()
 
     def bulk_create(self, products: List[Product]) -> List[Product]:
-        """Create multiple products in a single transaction."""
-        for product in products:
-            self.session.add(product)
+        """Create multiple products in a single transaction.
+
+        Rows are sent as one batched INSERT and their generated ids read back
+        via RETURNING, instead of flushing and refreshing each product.
+        """
+        if not products:
+            return products
+
+        statement = insert(Product).returning(
+            Product.id, sort_by_parameter_order=True
+        )
+        payload = [product.model_dump(exclude={"id"}) for product in products]
+        ids = self.session.exec(statement, params=payload).scalars().all()
         self.session.commit()
-        for product in products:
-            self.session.refresh(product)
+
+        for product, product_id in zip(products, ids):
+            product.id = product_id
         return products
 
+    def bulk_import(self, chunks: Iterable[List[Product]]) -> int:
+        """Insert chunks of products as they arrive, all in one transaction.
+
+        Unlike bulk_create, no ids are read back: each chunk is a single
+        executemany of a plain INSERT and the products are not modified. If
+        the iterable raises part way through, everything inserted so far is
+        rolled back and the exception is re-raised.
+
+        Returns:
+            Number of products imported
+        """
+        imported = 0
+        try:
+            for chunk in chunks:
+                if not chunk:
+                    continue
+                payload = [product.model_dump(exclude={"id"}) for product in chunk]
+                self.session.exec(insert(Product), params=payload)
+                imported += len(chunk)
+        except Exception:
+            self.session.rollback()
+            raise
+        self.session.commit()
+        return imported
+
     def search_by_tenant(
         self,
         tenant_id: int,
@@ -55,55 +228,96 @@ class ProductRepository:
         page: int = 1,
         size: int = 20,
     ) -> Tuple[List[Product], int]:
-        """Search products for a tenant with pagination."""
-        statement = select(Product).where(Product.tenant_id == tenant_id)
+        """Search products for a tenant with pagination.
+
+        Returns:
+            Tuple of (products, total); the COUNT query only runs when more
+            pages follow or the page is past the end
+        """
+        where_clauses = _search_filters(
+            tenant_id, query, product_fts_enabled(self.session)
+        )
+        _, sort_key = _resolve_sort(sort)
+        statement = (
+            select(Product)
+            .where(*where_clauses)
+            .order_by(*_order_by(sort_key, order == "desc"))
+        )
+
+        # Fetch one extra row: without it this is the last page, and the
+        # total follows from the offset with no COUNT query
+        offset = (page - 1) * size
+        products = list(self.session.exec(statement.offset(offset).limit(size + 1)))
+        if len(products) > size:
+            products = products[:size]
+        elif products or page == 1:
+            return products, offset + len(products)
+
+        # Get total count in SQL rather than materializing every match
+        total = self._count(where_clauses)
+
+        return products, total
+
+    def count_search(self, tenant_id: int, query: Optional[str] = None) -> int:
+        """Count the products search_by_tenant would match, without loading any."""
+        return self._count(
+            _search_filters(tenant_id, query, product_fts_enabled(self.session))
+        )
+
+    def _count(self, where_clauses: list) -> int:
+        statement = select(func.count()).select_from(Product).where(*where_clauses)
+        return self.session.exec(statement).one()
+
+    def search_by_tenant_after(
+        self,
+        tenant_id: int,
+        query: Optional[str] = None,
+        sort: str = "name",
+        order: str = "asc",
+        size: int = 20,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Product], Optional[str]]:
+        """Search products for a tenant with keyset (cursor) pagination.
 
-        # Add search filter if query provided
-        if query:
+        Seeks past the (sort value, id) position encoded in ``cursor`` instead
+        of skipping rows with OFFSET, so deep pages cost the same as the first.
+
+        Returns:
+            Tuple of (products, next_cursor); next_cursor is None on the last page
+        """
+        sort, sort_key = _resolve_sort(sort)
+        descending = order == "desc"
+
+        where_clauses = _search_filters(
+            tenant_id, query, product_fts_enabled(self.session)
+        )
+        statement = select(Product).where(*where_clauses)
+        if cursor:
+            last_value, last_id = decode_cursor(cursor)
+            if sort in ("created_at", "updated_at"):
+                last_value = datetime.fromisoformat(last_value)
             statement = statement.where(
-                Product.name.contains(query) | Product.description.contains(query)
+                _after_position(sort, sort_key, last_value, last_id, descending)
             )
 
-        # Add sorting
-        if sort == "name":
-            if order == "desc":
-                statement = statement.order_by(Product.name.desc())
-            else:
-                statement = statement.order_by(Product.name)
-        elif sort == "created_at":
-            if order == "desc":
-                statement = statement.order_by(Product.created_at.desc())
-            else:
-                statement = statement.order_by(Product.created_at)
-        elif sort == "updated_at":
-            if order == "desc":
-                statement = statement.order_by(Product.updated_at.desc())
-            else:
-                statement = statement.order_by(Product.updated_at)
-        elif sort == "cpm":
-            if order == "desc":
-                statement = statement.order_by(Product.cpm.desc())
-            else:
-                statement = statement.order_by(Product.cpm)
-        elif sort == "delivery_type":
-            if order == "desc":
-                statement = statement.order_by(Product.delivery_type.desc())
-            else:
-                statement = statement.order_by(Product.delivery_type)
-
-        # Get total count
-        count_statement = select(Product).where(Product.tenant_id == tenant_id)
-        if query:
-            count_statement = count_statement.where(
-                Product.name.contains(query) | Product.description.contains(query)
-            )
-        total = len(list(self.session.exec(count_statement)))
+        statement = statement.order_by(*_order_by(sort_key, descending))
+        # One extra row tells whether another page follows
+        products = list(self.session.exec(statement.limit(size + 1)))
 
-        # Add pagination
-        statement = statement.offset((page - 1) * size).limit(size)
-        products = list(self.session.exec(statement))
+        next_cursor = None
+        if len(products) > size:
+            products = products[:size]
+            next_cursor = cursor_after(products[-1], sort)
+        return products, next_cursor
 
-        return products, total
+    def count_by_tenant(self, tenant_id: int) -> int:
+        """Count a tenant's products without loading or ordering any rows."""
+        return self._count([Product.tenant_id == tenant_id])
+
+    def has_products(self, tenant_id: int) -> bool:
+        """Check whether a tenant has any products, stopping at the first row."""
+        statement = select(exists().where(Product.tenant_id == tenant_id))
+        return self.session.exec(statement).one()
 
     def delete_all_by_tenant(self, tenant_id: int) -> int:
         """Delete all products for a tenant.
@@ -114,30 +328,32 @@ class ProductRepository:
         Returns:
             Number of products deleted
         """
-        statement = select(Product).where(Product.tenant_id == tenant_id)
-        products = list(self.session.exec(statement))
-
-        for product in products:
-            self.session.delete(product)
-
+        statement = (
+            delete(Product)
+            .where(Product.tenant_id == tenant_id)
+            .execution_options(synchronize_session=False)
+        )
+        result = self.session.exec(statement)
         self.session.commit()
-        return len(products)
+        return result.rowcount
 
     def update(self, product: Product) -> Product:
-        """Update a product."""
-        from datetime import datetime
+        """Update a product.
 
-        product.updated_at = datetime.utcnow()
+        The product is not refreshed after commit; expired attributes reload
+        lazily, so callers that only redirect skip the extra SELECT.
+        """
+        product.updated_at = utc_now()
         self.session.add(product)
         self.session.commit()
-        self.session.refresh(product)
         return product
 
-    def delete(self, product_id: int) -> bool:
-        """Delete a product by ID."""
-        product = self.get_by_id(product_id)
-        if product:
-            self.session.delete(product)
-            self.session.commit()
-            return True
-        return False
+    def delete(self, product_id: int, tenant_id: Optional[int] = None) -> bool:
+        """Delete a product by ID, optionally only if it belongs to ``tenant_id``."""
+        statement = delete(Product).where(Product.id == product_id)
+        if tenant_id is not None:
+            statement = statement.where(Product.tenant_id == tenant_id)
+        statement = statement.execution_options(synchronize_session=False)
+        result = self.session.exec(statement)
+        self.session.commit()
+        return result.rowcount > 0
@@ -3,10 +3,24 @@
 from typing import List, Optional
 
 from fastapi import Depends
+from sqlalchemy import lambda_stmt
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import IntegrityError
 from sqlmodel import Session, select
 
-from ..models.tenant import Tenant
 from ..deps import get_db_session
+from ..models.tenant import Tenant
+from ..utils.timestamps import utc_now
+
+
+class DuplicateSlugError(Exception):
+    """Raised when creating or renaming a tenant to a slug that is taken."""
+
+    def __init__(self, slug: str):
+        super().__init__(
+            f"Slug '{slug}' is already taken. Please choose a different one."
+        )
+        self.slug = slug
 
 
 class TenantRepository:
@@ -15,36 +29,84 @@ class TenantRepository:
     def __init__(self, session: Session):
         self.session = session
 
-    def create(self, tenant: Tenant) -> Tenant:
-        """Create a new tenant."""
+    def _commit_tenant(self, tenant: Tenant) -> None:
+        """Commit a tenant, letting the slug's unique index reject duplicates.
+
+        Raises:
+            DuplicateSlugError: If another tenant already has the slug
+        """
+        # Read before committing: a rollback expires the tenant's attributes
+        slug = tenant.slug
         self.session.add(tenant)
-        self.session.commit()
+        try:
+            self.session.commit()
+        except IntegrityError as e:
+            self.session.rollback()
+            raise DuplicateSlugError(slug) from e
+
+    def create(self, tenant: Tenant) -> Tenant:
+        """Create a new tenant.
+
+        Raises:
+            DuplicateSlugError: If another tenant already has the slug
+        """
+        self._commit_tenant(tenant)
         self.session.refresh(tenant)
         return tenant
 
     def get_by_id(self, tenant_id: int) -> Optional[Tenant]:
-        """Get tenant by ID."""
-        statement = select(Tenant).where(Tenant.id == tenant_id)
-        return self.session.exec(statement).first()
+        """Get tenant by ID.
+
+        Served from the session's identity map when this request has already
+        loaded the tenant; otherwise a primary-key SELECT.
+        """
+        return self.session.get(Tenant, tenant_id)
 
     def get_by_slug(self, slug: str) -> Optional[Tenant]:
         """Get tenant by slug."""
-        statement = select(Tenant).where(Tenant.slug == slug)
-        return self.session.exec(statement).first()
+        statement = lambda_stmt(lambda: select(Tenant).where(Tenant.slug == slug))
+        return self.session.exec(statement).scalars().first()
 
     def list_all(self) -> List[Tenant]:
         """List all tenants."""
-        statement = select(Tenant).order_by(Tenant.name)
+        statement = lambda_stmt(lambda: select(Tenant).order_by(Tenant.name))
+        return list(self.session.exec(statement).scalars())
+
+    def list_minimal(self) -> List[Row]:
+        """List tenants as lightweight (id, name, slug) rows for the navbar.
+
+        Skips hydrating full Tenant models when only display fields are needed.
+        """
+        statement = select(Tenant.id, Tenant.name, Tenant.slug).order_by(Tenant.name)
+        return list(self.session.exec(statement))
+
+    def list_summary(self) -> List[Row]:
+        """List tenants as plain rows of the columns the tenants page shows.
+
+        Rows skip Tenant model construction and identity-map bookkeeping.
+        """
+        statement = lambda_stmt(
+            lambda: select(
+                Tenant.id,
+                Tenant.name,
+                Tenant.slug,
+                Tenant.created_at,
+                Tenant.updated_at,
+            ).order_by(Tenant.name)
+        )
         return list(self.session.exec(statement))
 
     def update(self, tenant: Tenant) -> Tenant:
-        """Update a tenant."""
-        from datetime import datetime
+        """Update a tenant.
 
-        tenant.updated_at = datetime.utcnow()
-        self.session.add(tenant)
-        self.session.commit()
-        self.session.refresh(tenant)
+        The tenant is not refreshed after commit; expired attributes reload
+        lazily, so callers that only redirect skip the extra SELECT.
+
+        Raises:
+            DuplicateSlugError: If another tenant already has the slug
+        """
+        tenant.updated_at = utc_now()
+        self._commit_tenant(tenant)
         return tenant
 
     def delete(self, tenant_id: int) -> bool:
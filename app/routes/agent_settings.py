@@ -4,21 +4,33 @@ from typing import Optional
 
 from fastapi import APIRouter, Depends, Form, HTTPException, Request
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
 from sqlmodel import Session
+from starlette.concurrency import run_in_threadpool
 
+from ..config import settings
 from ..deps import get_db_session
 from ..models.agent_settings import AgentSettings
+from ..models.tenant import Tenant
 from ..repositories.agent_settings import AgentSettingsRepository
 from ..repositories.tenants import TenantRepository
 from ..services.sales_agent import load_default_prompt
 from ..utils.cookies import get_active_tenant_id
-from ..config import settings
-
-templates = Jinja2Templates(directory="app/templates")
+from ..utils.templating import templates
 
 router = APIRouter()
 
+# Selectable models, in display order
+_MODEL_CHOICES = (
+    "gemini-1.5-pro",
+    "gemini-1.5-flash",
+    "claude-3-sonnet",
+    "claude-3-haiku",
+)
+VALID_MODELS = frozenset(_MODEL_CHOICES)
+_INVALID_MODEL_ERROR = (
+    f"Invalid model name. Must be one of: {', '.join(_MODEL_CHOICES)}"
+)
+
 
 def get_agent_settings_repo(
     session: Session = Depends(get_db_session),
@@ -34,8 +46,12 @@ def get_tenant_repo(session: Session = Depends(get_db_session)) -> TenantReposit
 
 def _validate_tenant_access(
     tenant_id: int, request: Request, tenant_repo: TenantRepository
-) -> None:
-    """Validate that the tenant exists and user has access."""
+) -> Tenant:
+    """Validate that the tenant exists and user has access.
+
+    Returns:
+        The validated tenant, so callers need not load it again
+    """
     # Check if tenant exists
     tenant = tenant_repo.get_by_id(tenant_id)
     if not tenant:
@@ -52,6 +68,8 @@ def _validate_tenant_access(
             },
         )
 
+    return tenant
+
 
 @router.get("/tenant/{tenant_id}/agent", response_class=HTMLResponse)
 async def show_agent_settings(
@@ -61,14 +79,15 @@ async def show_agent_settings(
     tenant_repo: TenantRepository = Depends(get_tenant_repo),
 ):
     """Show agent settings and effective prompt."""
-    # Validate tenant access
-    _validate_tenant_access(tenant_id, request, tenant_repo)
-
-    # Get tenant
-    tenant = tenant_repo.get_by_id(tenant_id)
+    # Validate tenant access and load settings off the event loop (sync DB I/O)
+    tenant = await run_in_threadpool(
+        _validate_tenant_access, tenant_id, request, tenant_repo
+    )
 
     # Get current settings
-    agent_settings = agent_settings_repo.get_by_tenant(tenant_id)
+    agent_settings = await run_in_threadpool(
+        agent_settings_repo.get_by_tenant, tenant_id
+    )
 
     # Load effective prompt
     try:
@@ -90,7 +109,6 @@ async def show_agent_settings(
             "agent_settings": agent_settings,
             "effective_prompt": effective_prompt,
             "using_default": using_default,
-            "config": request.app.state.settings,
         },
     )
 
@@ -106,8 +124,10 @@ async def update_agent_settings(
     tenant_repo: TenantRepository = Depends(get_tenant_repo),
 ):
     """Update agent settings."""
-    # Validate tenant access
-    _validate_tenant_access(tenant_id, request, tenant_repo)
+    # Validate tenant access (sync DB I/O, kept off the event loop)
+    tenant = await run_in_threadpool(
+        _validate_tenant_access, tenant_id, request, tenant_repo
+    )
 
     # Validate inputs
     errors = []
@@ -125,19 +145,13 @@ async def update_agent_settings(
         errors.append("Timeout must be between 1,000 and 120,000 milliseconds")
 
     # Validate model name
-    valid_models = [
-        "gemini-1.5-pro",
-        "gemini-1.5-flash",
-        "claude-3-sonnet",
-        "claude-3-haiku",
-    ]
-    if model_name not in valid_models:
-        errors.append(f"Invalid model name. Must be one of: {', '.join(valid_models)}")
+    if model_name not in VALID_MODELS:
+        errors.append(_INVALID_MODEL_ERROR)
 
     if errors:
-        # Get tenant for error display
-        tenant = tenant_repo.get_by_id(tenant_id)
-        agent_settings = agent_settings_repo.get_by_tenant(tenant_id)
+        agent_settings = await run_in_threadpool(
+            agent_settings_repo.get_by_tenant, tenant_id
+        )
 
         try:
             if agent_settings and agent_settings.prompt_override:
@@ -164,13 +178,13 @@ async def update_agent_settings(
                     "model_name": model_name,
                     "timeout_ms": timeout_ms,
                 },
-                "config": request.app.state.settings,
             },
             status_code=400,
         )
 
     # Update or create settings
-    agent_settings_repo.upsert_for_tenant(
+    await run_in_threadpool(
+        agent_settings_repo.upsert_for_tenant,
         tenant_id,
         prompt_override=prompt_override if prompt_override else None,
         model_name=model_name,
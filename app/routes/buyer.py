@@ -1,35 +1,53 @@
 """Buyer UI routes for brief input, agent selection, and results display."""
 
-import httpx
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
+import httpx
 from fastapi import APIRouter, Depends, Form, HTTPException, Request
 from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
+from starlette.concurrency import run_in_threadpool
 
-from ..config import settings
-from ..repositories.tenants import TenantRepository, get_tenant_repo
 from ..repositories.external_agents import (
     ExternalAgentRepository,
     get_external_agent_repo,
 )
-
+from ..repositories.tenants import TenantRepository, get_tenant_repo
+from ..utils.cache import (
+    BUYER_TENANTS_CACHE_KEY,
+    EXTERNAL_AGENTS_CACHE_KEY,
+    external_agents_cache,
+    tenants_cache,
+)
+from ..utils.templating import templates
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/templates")
 
 
-@router.get("/buyer", response_class=HTMLResponse)
-async def show_buyer_page(
-    request: Request,
-    tenant_repo: TenantRepository = Depends(get_tenant_repo),
-    external_agent_repo: ExternalAgentRepository = Depends(get_external_agent_repo),
-):
-    """Show buyer page with brief input and agent selection."""
-    # Get all tenants and enabled external agents
-    tenants = tenant_repo.list_all()
-    external_agents = external_agent_repo.list_enabled()
+def _load_pickers(
+    tenant_repo: TenantRepository, external_agent_repo: ExternalAgentRepository
+) -> Tuple[list, list]:
+    """Load tenants and enabled external agents, cached for a short TTL."""
+    tenants = tenants_cache.get(BUYER_TENANTS_CACHE_KEY)
+    if tenants is None:
+        tenants = tenant_repo.list_all()
+        tenants_cache.set(BUYER_TENANTS_CACHE_KEY, tenants)
+
+    external_agents = external_agents_cache.get(EXTERNAL_AGENTS_CACHE_KEY)
+    if external_agents is None:
+        external_agents = external_agent_repo.list_enabled()
+        external_agents_cache.set(EXTERNAL_AGENTS_CACHE_KEY, external_agents)
+
+    return tenants, external_agents
 
+
+def _render_buyer_page(
+    request: Request,
+    tenants: list,
+    external_agents: list,
+    error: Optional[str] = None,
+    **extra,
+) -> HTMLResponse:
+    """Render the buyer page with the agent pickers and any error or results."""
     return templates.TemplateResponse(
         "buyer/index.html",
         {
@@ -37,12 +55,26 @@ async def show_buyer_page(
             "tenants": tenants,
             "external_agents": external_agents,
             "results": None,
-            "error": None,
-            "config": request.app.state.settings,
+            "error": error,
+            **extra,
         },
     )
 
 
+@router.get("/buyer", response_class=HTMLResponse)
+async def show_buyer_page(
+    request: Request,
+    tenant_repo: TenantRepository = Depends(get_tenant_repo),
+    external_agent_repo: ExternalAgentRepository = Depends(get_external_agent_repo),
+):
+    """Show buyer page with brief input and agent selection."""
+    # Get all tenants and enabled external agents (sync DB I/O, off the loop)
+    tenants, external_agents = await run_in_threadpool(
+        _load_pickers, tenant_repo, external_agent_repo
+    )
+    return _render_buyer_page(request, tenants, external_agents)
+
+
 @router.post("/buyer", response_class=HTMLResponse)
 async def submit_buyer_brief(
     request: Request,
@@ -54,49 +86,38 @@ async def submit_buyer_brief(
     external_agent_repo: ExternalAgentRepository = Depends(get_external_agent_repo),
 ):
     """Submit buyer brief and orchestrate across selected agents."""
-    # Validate brief
-    if not brief or not brief.strip():
-        tenants = tenant_repo.list_all()
-        external_agents_list = external_agent_repo.list_enabled()
-        return templates.TemplateResponse(
-            "buyer/index.html",
-            {
-                "request": request,
-                "tenants": tenants,
-                "external_agents": external_agents_list,
-                "results": None,
-                "error": "Brief is required",
-                "config": request.app.state.settings,
-            },
+    async def render(error: Optional[str] = None, **extra) -> HTMLResponse:
+        # Pickers are loaded only once a response is rendered, so cheap
+        # validation failures return before touching the repositories; the
+        # sync DB I/O runs in the threadpool to keep the event loop free
+        tenants, external_agents_list = await run_in_threadpool(
+            _load_pickers, tenant_repo, external_agent_repo
+        )
+        return _render_buyer_page(
+            request, tenants, external_agents_list, error=error, **extra
         )
 
+    # Validate brief
+    brief = brief.strip() if brief else ""
+    if not brief:
+        return await render(error="Brief is required")
+
     # Validate at least one agent selected
     if not internal_tenants and not external_agents:
-        tenants = tenant_repo.list_all()
-        external_agents_list = external_agent_repo.list_enabled()
-        return templates.TemplateResponse(
-            "buyer/index.html",
-            {
-                "request": request,
-                "tenants": tenants,
-                "external_agents": external_agents_list,
-                "results": None,
-                "error": "Please select at least one agent",
-                "config": request.app.state.settings,
-            },
-        )
+        return await render(error="Please select at least one agent")
 
     # Build orchestrator request
     orchestrator_request = {
-        "brief": brief.strip(),
+        "brief": brief,
         "internal_tenant_slugs": internal_tenants if internal_tenants else None,
         "external_urls": external_agents if external_agents else None,
     }
 
     # Add timeout if provided
-    if timeout_ms and timeout_ms.strip():
+    timeout_ms = timeout_ms.strip() if timeout_ms else ""
+    if timeout_ms:
         try:
-            timeout_value = int(timeout_ms.strip())
+            timeout_value = int(timeout_ms)
             if timeout_value > 0:
                 orchestrator_request["timeout_ms"] = timeout_value
         except ValueError:
@@ -104,77 +125,25 @@ async def submit_buyer_brief(
             pass
 
     try:
-        # Call orchestrator via HTTP
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{settings.service_base_url}/orchestrate",
-                json=orchestrator_request,
-                timeout=30.0,  # 30 second timeout for the entire orchestration
-            )
+        # Call orchestrator via HTTP on the app's pooled client, which is based
+        # at service_base_url with a 30 second timeout for the whole orchestration
+        response = await request.app.state.http_client.post(
+            "/orchestrate", json=orchestrator_request
+        )
 
-            if response.status_code == 200:
-                results = response.json()
-                # Get fresh data for template
-                tenants = tenant_repo.list_all()
-                external_agents_list = external_agent_repo.list_enabled()
-
-                return templates.TemplateResponse(
-                    "buyer/index.html",
-                    {
-                        "request": request,
-                        "tenants": tenants,
-                        "external_agents": external_agents_list,
-                        "orchestrator_results": results,
-                        "error": None,
-                        "submitted_brief": brief.strip(),
-                        "selected_internal": internal_tenants,
-                        "selected_external": external_agents,
-                        "config": request.app.state.settings,
-                    },
-                )
-            else:
-                # Handle orchestrator errors
-                error_detail = response.json().get("detail", "Orchestration failed")
-                tenants = tenant_repo.list_all()
-                external_agents_list = external_agent_repo.list_enabled()
-
-                return templates.TemplateResponse(
-                    "buyer/index.html",
-                    {
-                        "request": request,
-                        "tenants": tenants,
-                        "external_agents": external_agents_list,
-                        "results": None,
-                        "error": f"Orchestration error: {error_detail}",
-                        "config": request.app.state.settings,
-                    },
-                )
+        if response.status_code == 200:
+            return await render(
+                orchestrator_results=response.json(),
+                submitted_brief=brief,
+                selected_internal=internal_tenants,
+                selected_external=external_agents,
+            )
+        else:
+            # Handle orchestrator errors
+            error_detail = response.json().get("detail", "Orchestration failed")
+            return await render(error=f"Orchestration error: {error_detail}")
 
     except httpx.TimeoutException:
-        tenants = tenant_repo.list_all()
-        external_agents_list = external_agent_repo.list_enabled()
-        return templates.TemplateResponse(
-            "buyer/index.html",
-            {
-                "request": request,
-                "tenants": tenants,
-                "external_agents": external_agents_list,
-                "results": None,
-                "error": "Orchestration timed out. Please try again.",
-                "config": request.app.state.settings,
-            },
-        )
+        return await render(error="Orchestration timed out. Please try again.")
     except Exception as e:
-        tenants = tenant_repo.list_all()
-        external_agents_list = external_agent_repo.list_enabled()
-        return templates.TemplateResponse(
-            "buyer/index.html",
-            {
-                "request": request,
-                "tenants": tenants,
-                "external_agents": external_agents_list,
-                "results": None,
-                "error": f"Unexpected error: {str(e)}",
-                "config": request.app.state.settings,
-            },
-        )
+        return await render(error=f"Unexpected error: {str(e)}")
@@ -4,30 +4,29 @@ from typing import Optional
 
 from fastapi import APIRouter, Depends, Form, HTTPException, Request
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
 from sqlmodel import Session
 
+from ..db import get_session
 from ..models.external_agent import ExternalAgent
 from ..repositories.external_agents import (
     ExternalAgentRepository,
     get_external_agent_repo,
 )
-from ..db import get_session
-
+from ..utils.cache import external_agents_cache
+from ..utils.templating import templates
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/templates")
 
 
 @router.get("/external-agents", response_class=HTMLResponse)
-async def list_external_agents(
+def list_external_agents(
     request: Request,
     external_agent_repo: ExternalAgentRepository = Depends(get_external_agent_repo),
 ):
     """List all external agents."""
     agents = external_agent_repo.list_all()
     return templates.TemplateResponse(
-        "external_agents/index.html", {"request": request, "agents": agents, "config": request.app.state.settings}
+        "external_agents/index.html", {"request": request, "agents": agents}
     )
 
 
@@ -36,12 +35,12 @@ async def show_add_external_agent_form(request: Request):
     """Show form to add a new external agent."""
     return templates.TemplateResponse(
         "external_agents/form.html",
-        {"request": request, "agent": None, "is_edit": False, "config": request.app.state.settings},
+        {"request": request, "agent": None, "is_edit": False},
     )
 
 
 @router.post("/external-agents/add", response_class=HTMLResponse)
-async def add_external_agent(
+def add_external_agent(
     request: Request,
     name: str = Form(...),
     base_url: str = Form(...),
@@ -58,7 +57,6 @@ async def add_external_agent(
                 "agent": None,
                 "is_edit": False,
                 "error": "Name is required",
-                "config": request.app.state.settings,
             },
         )
 
@@ -70,7 +68,6 @@ async def add_external_agent(
                 "agent": None,
                 "is_edit": False,
                 "error": "Base URL is required",
-                "config": request.app.state.settings,
             },
         )
 
@@ -79,6 +76,7 @@ async def add_external_agent(
 
     try:
         external_agent_repo.create(agent)
+        external_agents_cache.invalidate()
         return RedirectResponse(
             url="/external-agents?message=External agent added successfully",
             status_code=302,
@@ -91,13 +89,12 @@ async def add_external_agent(
                 "agent": None,
                 "is_edit": False,
                 "error": f"Failed to create agent: {str(e)}",
-                "config": request.app.state.settings,
             },
         )
 
 
 @router.get("/external-agents/{agent_id}/edit", response_class=HTMLResponse)
-async def show_edit_external_agent_form(
+def show_edit_external_agent_form(
     request: Request,
     agent_id: int,
     external_agent_repo: ExternalAgentRepository = Depends(get_external_agent_repo),
@@ -109,12 +106,12 @@ async def show_edit_external_agent_form(
 
     return templates.TemplateResponse(
         "external_agents/form.html",
-        {"request": request, "agent": agent, "is_edit": True, "config": request.app.state.settings},
+        {"request": request, "agent": agent, "is_edit": True},
     )
 
 
 @router.post("/external-agents/{agent_id}/edit", response_class=HTMLResponse)
-async def edit_external_agent(
+def edit_external_agent(
     request: Request,
     agent_id: int,
     name: str = Form(...),
@@ -136,7 +133,6 @@ async def edit_external_agent(
                 "agent": agent,
                 "is_edit": True,
                 "error": "Name is required",
-                "config": request.app.state.settings,
             },
         )
 
@@ -148,7 +144,6 @@ async def edit_external_agent(
                 "agent": agent,
                 "is_edit": True,
                 "error": "Base URL is required",
-                "config": request.app.state.settings,
             },
         )
 
@@ -159,6 +154,7 @@ async def edit_external_agent(
 
     try:
         external_agent_repo.update(agent)
+        external_agents_cache.invalidate()
         return RedirectResponse(
             url="/external-agents?message=External agent updated successfully",
             status_code=302,
@@ -171,13 +167,12 @@ async def edit_external_agent(
                 "agent": agent,
                 "is_edit": True,
                 "error": f"Failed to update agent: {str(e)}",
-                "config": request.app.state.settings,
             },
         )
 
 
 @router.post("/external-agents/{agent_id}/delete", response_class=HTMLResponse)
-async def delete_external_agent(
+def delete_external_agent(
     request: Request,
     agent_id: int,
     external_agent_repo: ExternalAgentRepository = Depends(get_external_agent_repo),
@@ -186,6 +181,7 @@ async def delete_external_agent(
     success = external_agent_repo.delete(agent_id)
     if not success:
         raise HTTPException(status_code=404, detail="External agent not found")
+    external_agents_cache.invalidate()
 
     return RedirectResponse(
         url="/external-agents?message=External agent deleted successfully",
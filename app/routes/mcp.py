@@ -7,23 +7,37 @@ Source files used for AdCP contract alignment:
 
 import os
 import subprocess
-from typing import Dict, Any, List
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
 
 from fastapi import APIRouter, Depends, HTTPException, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from sqlmodel import Session
+from starlette.concurrency import run_in_threadpool
 
+from ..ai.errors import AIConfigError, AIRequestError, AITimeoutError
 from ..config import settings
-from ..services.sales_agent import evaluate_brief
-from ..repositories.tenants import TenantRepository, get_tenant_repo
-from ..repositories.products import ProductRepository
-from ..repositories.agent_settings import AgentSettingsRepository
 from ..deps import get_db_session
-
+from ..repositories.agent_settings import AgentSettingsRepository
+from ..repositories.products import ProductRepository
+from ..repositories.tenants import TenantRepository, get_tenant_repo
+from ..services.sales_agent import evaluate_brief
+from ..utils.etag import conditional_json_response, json_snapshot
 
 router = APIRouter()
 
+# Service info only changes on deploy; clients may reuse it for a minute
+MCP_INFO_MAX_AGE = 60
+
+# AdCP status and error type for each AI failure; anything else is internal
+_AI_ERRORS: Dict[type, Tuple[int, str]] = {
+    AIConfigError: (500, "ai_config_error"),
+    AITimeoutError: (408, "timeout"),
+    AIRequestError: (502, "ai_request_error"),
+}
+_INTERNAL_ERROR = (500, "internal")
+
 
 class AdCPRankingRequest(BaseModel):
     """AdCP ranking request model."""
@@ -56,8 +70,16 @@ def get_agent_settings_repo(
     return AgentSettingsRepository(session)
 
 
+@lru_cache(maxsize=1)
 def get_git_commit_hash() -> str:
-    """Get current git commit hash for traceability."""
+    """Get current git commit hash for traceability.
+
+    Resolved once per process: a GIT_COMMIT baked in at build time wins,
+    otherwise git is asked on first use and the answer memoized.
+    """
+    commit = os.environ.get("GIT_COMMIT")
+    if commit:
+        return commit
     try:
         result = subprocess.run(
             ["git", "rev-parse", "--short", "HEAD"],
@@ -72,8 +94,7 @@ def get_git_commit_hash() -> str:
     return "unknown"
 
 
-@router.get("/mcp/")
-async def get_mcp_info():
+async def get_mcp_info() -> Dict[str, Any]:
     """Get MCP service information and capabilities."""
     adcp_version = os.getenv("ADCP_VERSION", "adcp-demo-0.1")
     commit_hash = get_git_commit_hash()
@@ -86,6 +107,33 @@ async def get_mcp_info():
     }
 
 
+@router.get("/mcp/")
+async def serve_mcp_info(request: Request):
+    """Serve MCP service information with an ETag so pollers can revalidate."""
+    snapshot = json_snapshot(await get_mcp_info())
+    return conditional_json_response(request, snapshot, max_age=MCP_INFO_MAX_AGE)
+
+
+def _error_response(
+    status_code: int, error_type: str, message: str
+) -> ORJSONResponse:
+    """Build an AdCP error response."""
+    return ORJSONResponse(
+        status_code=status_code,
+        content={
+            "error": {"type": error_type, "message": message, "status": status_code}
+        },
+    )
+
+
+def _ai_error_status(error: Exception) -> Tuple[int, str]:
+    """Map an exception to its AdCP status code and error type."""
+    for cls in type(error).__mro__:
+        if cls in _AI_ERRORS:
+            return _AI_ERRORS[cls]
+    return _INTERNAL_ERROR
+
+
 @router.post("/mcp/agents/{tenant_slug}/rank")
 async def rank_products(
     tenant_slug: str,
@@ -101,78 +149,39 @@ async def rank_products(
     Calls sales_agent.evaluate_brief and returns AdCP-compliant response.
     """
     # Validate tenant exists
-    tenant = tenant_repo.get_by_slug(tenant_slug)
+    tenant = await run_in_threadpool(tenant_repo.get_by_slug, tenant_slug)
     if not tenant:
-        return JSONResponse(
-            status_code=404,
-            content={
-                "error": {
-                    "type": "invalid_request",
-                    "message": f"Tenant '{tenant_slug}' not found",
-                    "status": 404,
-                }
-            },
+        return _error_response(
+            404, "invalid_request", f"Tenant '{tenant_slug}' not found"
         )
 
-    # Validate brief is present and non-empty
-    if not request.brief or not request.brief.strip():
-        return JSONResponse(
-            status_code=400,
-            content={
-                "error": {
-                    "type": "invalid_request",
-                    "message": "Brief is required and must be non-empty",
-                    "status": 400,
-                }
-            },
+    # Validate brief is present and non-empty, stripping it only once
+    brief = request.brief.strip() if request.brief else ""
+    if not brief:
+        return _error_response(
+            400, "invalid_request", "Brief is required and must be non-empty"
         )
 
     # Check if tenant has products
-    products = product_repo.list_by_tenant(tenant.id)
-    if not products:
-        return JSONResponse(
-            status_code=422,
-            content={
-                "error": {
-                    "type": "invalid_request",
-                    "message": f"No products found for tenant '{tenant_slug}'. Please add products before using AI evaluation.",
-                    "status": 422,
-                }
-            },
+    if not await run_in_threadpool(product_repo.has_products, tenant.id):
+        return _error_response(
+            422,
+            "invalid_request",
+            f"No products found for tenant '{tenant_slug}'. Please add products before using AI evaluation.",
         )
 
     try:
         # Call sales agent service
         results = await evaluate_brief(
             tenant_id=tenant.id,
-            brief=request.brief.strip(),
+            brief=brief,
             agent_settings_repo=agent_settings_repo,
             product_repo=product_repo,
             tenant_repo=tenant_repo,
         )
-
-        # Return AdCP-compliant response
-        return {"items": results}
-
     except Exception as e:
-        # Map exceptions to AdCP error responses
-        error_type = "internal"
-        status_code = 500
-
-        # Check for specific AI exceptions
-        if "AIConfigError" in str(type(e)) or "missing" in str(e).lower():
-            error_type = "ai_config_error"
-            status_code = 500
-        elif "AITimeoutError" in str(type(e)) or "timeout" in str(e).lower():
-            error_type = "timeout"
-            status_code = 408
-        elif "AIRequestError" in str(type(e)) or "request" in str(e).lower():
-            error_type = "ai_request_error"
-            status_code = 502
-
-        return JSONResponse(
-            status_code=status_code,
-            content={
-                "error": {"type": error_type, "message": str(e), "status": status_code}
-            },
-        )
+        status_code, error_type = _ai_error_status(e)
+        return _error_response(status_code, error_type, str(e))
+
+    # Return AdCP-compliant response
+    return {"items": results}
@@ -1,17 +1,18 @@
 """Orchestrator routes for fanning out buyer briefs to multiple agents."""
 
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
 
-from ..services.orchestrator import orchestrate
-from ..repositories.tenants import TenantRepository, get_tenant_repo
 from ..repositories.external_agents import (
     ExternalAgentRepository,
     get_external_agent_repo,
 )
-
+from ..repositories.tenants import TenantRepository, get_tenant_repo
+from ..services.orchestrator import orchestrate
 
 router = APIRouter()
 
@@ -34,6 +35,28 @@ class OrchestrateResponse(BaseModel):
     timeout_ms: int
 
 
+def _resolve_agents(
+    request: OrchestrateRequest,
+    tenant_repo: TenantRepository,
+    external_agent_repo: ExternalAgentRepository,
+) -> Tuple[List[str], List[str]]:
+    """Return the requested agents, defaulting omitted lists to all available."""
+    # Get internal tenant slugs (default to all if not specified)
+    internal_slugs = request.internal_tenant_slugs
+    if internal_slugs is None:
+        tenants = tenant_repo.list_all()
+        internal_slugs = [tenant.slug for tenant in tenants]
+
+    # Get external URLs (default to all enabled if not specified)
+    external_urls = request.external_urls
+    if external_urls is None:
+        external_agents = external_agent_repo.list_enabled()
+        external_urls = [agent.base_url for agent in external_agents]
+
+    return internal_slugs, external_urls
+
+
+# OrchestrateResponse documents the shape; the route returns its own response
 @router.post("/orchestrate", response_model=OrchestrateResponse)
 async def orchestrate_brief(
     request: OrchestrateRequest,
@@ -45,21 +68,15 @@ async def orchestrate_brief(
 
     If internal_tenant_slugs or external_urls are omitted, defaults to all available agents.
     """
-    # Validate brief
-    if not request.brief or not request.brief.strip():
+    # Validate brief; isspace() checks whitespace-only without copying the brief
+    if not request.brief or request.brief.isspace():
         raise HTTPException(status_code=400, detail="Brief must be non-empty")
 
-    # Get internal tenant slugs (default to all if not specified)
-    internal_slugs = request.internal_tenant_slugs
-    if internal_slugs is None:
-        tenants = tenant_repo.list_all()
-        internal_slugs = [tenant.slug for tenant in tenants]
-
-    # Get external URLs (default to all enabled if not specified)
-    external_urls = request.external_urls
-    if external_urls is None:
-        external_agents = external_agent_repo.list_enabled()
-        external_urls = [agent.base_url for agent in external_agents]
+    # Resolve default agents in one threadpool hop: the lookups are sync DB
+    # I/O and share a Session, which must not be used from two threads at once
+    internal_slugs, external_urls = await run_in_threadpool(
+        _resolve_agents, request, tenant_repo, external_agent_repo
+    )
 
     # Validate that we have at least one agent
     if not internal_slugs and not external_urls:
@@ -77,7 +94,9 @@ async def orchestrate_brief(
             timeout_ms=request.timeout_ms,
         )
 
-        return OrchestrateResponse(**result)
+        # orchestrate() builds this dict itself; returning a Response skips
+        # FastAPI's validation and re-encoding walk over every agent result
+        return ORJSONResponse(result)
 
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
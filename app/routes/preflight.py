@@ -1,39 +1,81 @@
 """Preflight check routes for system readiness."""
 
+import asyncio
+import weakref
+from typing import Any, Dict, Tuple
+
 from fastapi import APIRouter, Request
 from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
+from starlette.concurrency import run_in_threadpool
 
-from ..services.preflight import run_checks, get_overall_status, get_status_summary
+from ..services.preflight import build_preflight_report
+from ..utils.cache import PREFLIGHT_CACHE_KEY, preflight_cache
+from ..utils.etag import JSONSnapshot, conditional_json_response, json_snapshot
+from ..utils.templating import templates
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/templates")
 
+# One refresh lock per event loop; asyncio locks cannot be shared across loops
+_refresh_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = (
+    weakref.WeakKeyDictionary()
+)
 
-@router.get("/preflight")
-async def get_preflight_checks():
-    """Get preflight checks as JSON."""
-    checks = run_checks()
-    overall_status = get_overall_status(checks)
-    summary = get_status_summary(checks)
 
-    return {"overall_status": overall_status, "summary": summary, "checks": checks}
+def _refresh_lock() -> asyncio.Lock:
+    loop = asyncio.get_running_loop()
+    lock = _refresh_locks.get(loop)
+    if lock is None:
+        lock = _refresh_locks[loop] = asyncio.Lock()
+    return lock
+
+
+async def _load_preflight() -> Tuple[Dict[str, Any], JSONSnapshot]:
+    """Return the cached report and its serialized form, refreshing once expired.
+
+    Concurrent callers that find the cache expired share a single refresh, and
+    the blocking checks run in the threadpool. The JSON body and its ETag are
+    built once per refresh.
+    """
+    cached = preflight_cache.get(PREFLIGHT_CACHE_KEY)
+    if cached is not None:
+        return cached
+
+    async with _refresh_lock():
+        # Another caller may have refreshed while this one waited
+        cached = preflight_cache.get(PREFLIGHT_CACHE_KEY)
+        if cached is None:
+            report = await run_in_threadpool(build_preflight_report)
+            cached = (report, json_snapshot(report))
+            preflight_cache.set(PREFLIGHT_CACHE_KEY, cached)
+    return cached
+
+
+async def get_preflight_report() -> Dict[str, Any]:
+    """Return the cached preflight report, re-running the checks once expired."""
+    report, _ = await _load_preflight()
+    return report
+
+
+@router.get("/preflight")
+async def get_preflight_checks(request: Request):
+    """Get preflight checks as JSON, honoring If-None-Match."""
+    _, snapshot = await _load_preflight()
+    return conditional_json_response(
+        request, snapshot, max_age=int(preflight_cache.ttl_seconds)
+    )
 
 
 @router.get("/preflight/ui", response_class=HTMLResponse)
 async def get_preflight_ui(request: Request):
     """Get preflight checks as HTML page."""
-    checks = run_checks()
-    overall_status = get_overall_status(checks)
-    summary = get_status_summary(checks)
+    report = await get_preflight_report()
 
     return templates.TemplateResponse(
         "preflight/index.html",
         {
             "request": request,
-            "overall_status": overall_status,
-            "summary": summary,
-            "checks": checks,
-            "config": request.app.state.settings,
+            "overall_status": report["overall_status"],
+            "summary": report["summary"],
+            "checks": report["checks"],
         },
     )
@@ -2,55 +2,45 @@
 
 from fastapi import APIRouter, Depends, Form, Request
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
 
+from ...models.tenant import Tenant
 from ...repositories.products import ProductRepository
-from ...repositories.tenants import TenantRepository
-from .shared import _validate_tenant_access, get_product_repo, get_tenant_repo
-
-templates = Jinja2Templates(directory="app/templates")
+from ...utils.templating import templates
+from .shared import get_product_repo, get_validated_tenant
 
 router = APIRouter()
 
 
 @router.get("/tenant/{tenant_id}/products/bulk-delete", response_class=HTMLResponse)
-async def bulk_delete_confirm(
+def bulk_delete_confirm(
     request: Request,
     tenant_id: int,
-    tenant_repo: TenantRepository = Depends(get_tenant_repo),
+    tenant: Tenant = Depends(get_validated_tenant),
     product_repo: ProductRepository = Depends(get_product_repo),
 ):
     """Show bulk delete confirmation page."""
-    # Validate tenant access
-    tenant = _validate_tenant_access(tenant_id, request, tenant_repo)
-
     # Get product count
-    products, total = product_repo.search_by_tenant(tenant_id=tenant_id, page=1, size=1)
+    total = product_repo.count_by_tenant(tenant_id)
 
     return templates.TemplateResponse(
         "products/bulk_delete_confirm.html",
-        {"request": request, "tenant": tenant, "product_count": total, "config": request.app.state.settings},
+        {"request": request, "tenant": tenant, "product_count": total},
     )
 
 
 @router.post("/tenant/{tenant_id}/products/bulk-delete", response_class=HTMLResponse)
-async def bulk_delete_products(
+def bulk_delete_products(
     request: Request,
     tenant_id: int,
     confirmation: str = Form(...),
     product_repo: ProductRepository = Depends(get_product_repo),
-    tenant_repo: TenantRepository = Depends(get_tenant_repo),
+    tenant: Tenant = Depends(get_validated_tenant),
 ):
     """Bulk delete all products for a tenant."""
-    # Validate tenant access
-    tenant = _validate_tenant_access(tenant_id, request, tenant_repo)
-
     # Validate confirmation
     if confirmation != "DELETE":
         # Get product count for template
-        products, total = product_repo.search_by_tenant(
-            tenant_id=tenant_id, page=1, size=1
-        )
+        total = product_repo.count_by_tenant(tenant_id)
 
         return templates.TemplateResponse(
             "products/bulk_delete_confirm.html",
@@ -59,7 +49,6 @@ async def bulk_delete_products(
                 "tenant": tenant,
                 "product_count": total,
                 "error": "Please type 'DELETE' to confirm",
-                "config": request.app.state.settings,
             },
             status_code=400,
         )
@@ -1,22 +1,52 @@
 """Product CSV operations routes."""
 
+import codecs
+import io
+from typing import BinaryIO, List, Optional
+
 from fastapi import APIRouter, Depends, File, HTTPException, Request, UploadFile
 from fastapi.responses import HTMLResponse, RedirectResponse, Response
-from fastapi.templating import Jinja2Templates
+from starlette.concurrency import run_in_threadpool
 
+from ...models.tenant import Tenant
 from ...repositories.products import ProductRepository
 from ...repositories.tenants import TenantRepository
-from ...services.csv_import import parse_csv_content
+from ...services.csv_import import CSVRowErrors, iter_product_chunks
 from ...services.csv_template import generate_csv_template
+from ...utils.pagination import total_pages
+from ...utils.templating import templates
 from .shared import _validate_tenant_access, get_product_repo, get_tenant_repo
 
-templates = Jinja2Templates(directory="app/templates")
-
 router = APIRouter()
 
+# Products shown on the list page re-rendered after a failed upload
+_ERROR_PAGE_SIZE = 20
+
+
+def _import_csv(
+    upload: BinaryIO, tenant_id: int, product_repo: ProductRepository
+) -> int:
+    """Stream an uploaded CSV into the database, decoding it line by line.
+
+    TextIOWrapper decodes in C and, with ``newline=""`` as the csv module
+    expects, only ends rows at CR or LF. Before Python 3.11 the upload's
+    SpooledTemporaryFile is not an io.IOBase, so it falls back to a codecs
+    stream reader there.
+    """
+    if not isinstance(upload, io.IOBase):
+        lines = codecs.getreader("utf-8")(upload)
+        return product_repo.bulk_import(iter_product_chunks(lines, tenant_id))
+
+    text = io.TextIOWrapper(upload, encoding="utf-8", newline="")
+    try:
+        return product_repo.bulk_import(iter_product_chunks(text, tenant_id))
+    finally:
+        # Hand the file back open; the UploadFile owns closing it
+        text.detach()
+
 
 @router.get("/tenant/{tenant_id}/products/template.csv")
-async def download_csv_template(
+def download_csv_template(
     tenant_id: int, tenant_repo: TenantRepository = Depends(get_tenant_repo)
 ):
     """Download CSV template for product import."""
@@ -36,6 +66,45 @@ async def download_csv_template(
     )
 
 
+async def _render_upload_error(
+    request: Request,
+    tenant: Tenant,
+    tenant_id: int,
+    product_repo: ProductRepository,
+    error: str,
+    error_details: Optional[List[str]] = None,
+) -> HTMLResponse:
+    """Re-render the first page of the product list with an upload error.
+
+    The listing is only queried here, so successful uploads never load it.
+    """
+    products, total = await run_in_threadpool(
+        product_repo.search_by_tenant,
+        tenant_id=tenant_id,
+        page=1,
+        size=_ERROR_PAGE_SIZE,
+    )
+
+    return templates.TemplateResponse(
+        "products/index.html",
+        {
+            "request": request,
+            "tenant": tenant,
+            "products": products,
+            "total": total,
+            "page": 1,
+            "size": _ERROR_PAGE_SIZE,
+            "total_pages": total_pages(total, _ERROR_PAGE_SIZE),
+            "query": None,
+            "sort": "name",
+            "order": "asc",
+            "error": error,
+            "error_details": error_details,
+        },
+        status_code=400,
+    )
+
+
 @router.post("/tenant/{tenant_id}/products/bulk-upload", response_class=HTMLResponse)
 async def bulk_upload_products(
     request: Request,
@@ -46,102 +115,40 @@ async def bulk_upload_products(
 ):
     """Bulk upload products from CSV."""
     # Validate tenant access
-    tenant = _validate_tenant_access(tenant_id, request, tenant_repo)
+    tenant = await run_in_threadpool(
+        _validate_tenant_access, tenant_id, request, tenant_repo
+    )
 
     # Validate file
     if not file.filename.endswith(".csv"):
-        # Get products list to provide template context
-        products, total = product_repo.search_by_tenant(
-            tenant_id=tenant_id, page=1, size=20
-        )
-
-        return templates.TemplateResponse(
-            "products/index.html",
-            {
-                "request": request,
-                "tenant": tenant,
-                "products": products,
-                "total": total,
-                "page": 1,
-                "size": 20,
-                "total_pages": 1,
-                "query": None,
-                "sort": "name",
-                "order": "asc",
-                "error": "Please upload a CSV file",
-                "config": request.app.state.settings,
-            },
-            status_code=400,
+        return await _render_upload_error(
+            request, tenant, tenant_id, product_repo, "Please upload a CSV file"
         )
 
     try:
-        # Read CSV content
-        csv_content = await file.read()
-        csv_content_str = csv_content.decode("utf-8")
-
-        # Parse and validate CSV
-        products, errors = parse_csv_content(csv_content_str, tenant_id)
-
-        if errors:
-            # Return error details
-            error_messages = [
-                f"Row {e.row_number}: {e.field} - {e.message}" for e in errors
-            ]
-            # Get products list to provide template context
-            products, total = product_repo.search_by_tenant(
-                tenant_id=tenant_id, page=1, size=20
-            )
-
-            return templates.TemplateResponse(
-                "products/index.html",
-                {
-                    "request": request,
-                    "tenant": tenant,
-                    "products": products,
-                    "total": total,
-                    "page": 1,
-                    "size": 20,
-                    "total_pages": 1,
-                    "query": None,
-                    "sort": "name",
-                    "order": "asc",
-                    "error": "CSV import failed",
-                    "error_details": error_messages,
-                    "config": request.app.state.settings,
-                },
-                status_code=400,
-            )
-
-        # Import products
-        if products:
-            product_repo.bulk_create(products)
-
-        return RedirectResponse(
-            url=f"/tenant/{tenant_id}/products?message=Successfully imported {len(products)} products",
-            status_code=302,
+        # Parse, validate and insert the CSV off the event loop
+        imported = await run_in_threadpool(
+            _import_csv, file.file, tenant_id, product_repo
+        )
+    except CSVRowErrors as e:
+        error_messages = [
+            f"Row {error.row_number}: {error.field} - {error.message}"
+            for error in e.errors
+        ]
+        return await _render_upload_error(
+            request,
+            tenant,
+            tenant_id,
+            product_repo,
+            "CSV import failed",
+            error_details=error_messages,
         )
-
     except Exception as e:
-        # Get products list to provide template context
-        products, total = product_repo.search_by_tenant(
-            tenant_id=tenant_id, page=1, size=20
+        return await _render_upload_error(
+            request, tenant, tenant_id, product_repo, f"Error processing CSV: {str(e)}"
         )
 
-        return templates.TemplateResponse(
-            "products/index.html",
-            {
-                "request": request,
-                "tenant": tenant,
-                "products": products,
-                "total": total,
-                "page": 1,
-                "size": 20,
-                "total_pages": 1,
-                "query": None,
-                "sort": "name",
-                "order": "asc",
-                "error": f"Error processing CSV: {str(e)}",
-                "config": request.app.state.settings,
-            },
-            status_code=400,
-        )
+    return RedirectResponse(
+        url=f"/tenant/{tenant_id}/products?message=Successfully imported {imported} products",
+        status_code=302,
+    )
@@ -4,13 +4,11 @@ from typing import Optional
 
 from fastapi import APIRouter, Depends, Form, HTTPException, Request
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
 
+from ...models.tenant import Tenant
 from ...repositories.products import ProductRepository
-from ...repositories.tenants import TenantRepository
-from .shared import _validate_tenant_access, get_product_repo, get_tenant_repo
-
-templates = Jinja2Templates(directory="app/templates")
+from ...utils.templating import templates
+from .shared import get_product_repo, get_validated_tenant
 
 router = APIRouter()
 
@@ -18,17 +16,14 @@ router = APIRouter()
 @router.get(
     "/tenant/{tenant_id}/products/{product_id}/edit", response_class=HTMLResponse
 )
-async def edit_product_form(
+def edit_product_form(
     request: Request,
     tenant_id: int,
     product_id: int,
     product_repo: ProductRepository = Depends(get_product_repo),
-    tenant_repo: TenantRepository = Depends(get_tenant_repo),
+    tenant: Tenant = Depends(get_validated_tenant),
 ):
     """Show edit product form."""
-    # Validate tenant access
-    tenant = _validate_tenant_access(tenant_id, request, tenant_repo)
-
     # Get product
     product = product_repo.get_by_id(product_id)
     if not product or product.tenant_id != tenant_id:
@@ -36,14 +31,14 @@ async def edit_product_form(
 
     return templates.TemplateResponse(
         "products/form.html",
-        {"request": request, "tenant": tenant, "product": product, "action": "edit", "config": request.app.state.settings},
+        {"request": request, "tenant": tenant, "product": product, "action": "edit"},
     )
 
 
 @router.post(
     "/tenant/{tenant_id}/products/{product_id}/edit", response_class=HTMLResponse
 )
-async def update_product(
+def update_product(
     request: Request,
     tenant_id: int,
     product_id: int,
@@ -57,12 +52,9 @@ async def update_product(
     targeted_ages: Optional[str] = Form(None),
     verified_minimum_age: Optional[str] = Form(None),
     product_repo: ProductRepository = Depends(get_product_repo),
-    tenant_repo: TenantRepository = Depends(get_tenant_repo),
+    tenant: Tenant = Depends(get_validated_tenant),
 ):
     """Update a product."""
-    # Validate tenant access
-    tenant = _validate_tenant_access(tenant_id, request, tenant_repo)
-
     # Get product
     product = product_repo.get_by_id(product_id)
     if not product or product.tenant_id != tenant_id:
@@ -99,31 +91,24 @@ async def update_product(
                 "product": product,
                 "action": "edit",
                 "error": f"Error updating product: {str(e)}",
-                "config": request.app.state.settings,
             },
             status_code=400,
         )
 
 
 @router.post(
-    "/tenant/{tenant_id}/products/{product_id}/delete", response_class=HTMLResponse
+    "/tenant/{tenant_id}/products/{product_id}/delete",
+    response_class=HTMLResponse,
+    dependencies=[Depends(get_validated_tenant)],
 )
-async def delete_product(
-    request: Request,
+def delete_product(
     tenant_id: int,
     product_id: int,
     product_repo: ProductRepository = Depends(get_product_repo),
-    tenant_repo: TenantRepository = Depends(get_tenant_repo),
 ):
     """Delete a product."""
-    # Validate tenant access
-    _validate_tenant_access(tenant_id, request, tenant_repo)
-
-    # Get product
-    product = product_repo.get_by_id(product_id)
-    if not product or product.tenant_id != tenant_id:
+    # Delete product, scoped to the tenant so no separate lookup is needed
+    if not product_repo.delete(product_id, tenant_id=tenant_id):
         raise HTTPException(status_code=404, detail="Product not found")
 
-    # Delete product
-    product_repo.delete(product_id)
     return RedirectResponse(url=f"/tenant/{tenant_id}/products", status_code=302)
@@ -4,20 +4,18 @@ from typing import Optional
 
 from fastapi import APIRouter, Depends, Request
 from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
 
-from ...repositories.products import ProductRepository
-from ...repositories.tenants import TenantRepository
-from ...utils.pagination import clamp_pagination
-from .shared import _validate_tenant_access, get_product_repo, get_tenant_repo
-
-templates = Jinja2Templates(directory="app/templates")
+from ...models.tenant import Tenant
+from ...repositories.products import ProductRepository, cursor_after
+from ...utils.pagination import clamp_pagination, total_pages
+from ...utils.templating import templates
+from .shared import get_product_repo, get_validated_tenant
 
 router = APIRouter()
 
 
 @router.get("/tenant/{tenant_id}/products", response_class=HTMLResponse)
-async def list_products(
+def list_products(
     request: Request,
     tenant_id: int,
     q: Optional[str] = None,
@@ -25,23 +23,42 @@ async def list_products(
     order: str = "asc",
     page: int = 1,
     size: int = 20,
+    after: Optional[str] = None,
     product_repo: ProductRepository = Depends(get_product_repo),
-    tenant_repo: TenantRepository = Depends(get_tenant_repo),
+    tenant: Tenant = Depends(get_validated_tenant),
 ):
     """List products for a tenant with search, sort, and pagination."""
-    # Validate tenant access
-    tenant = _validate_tenant_access(tenant_id, request, tenant_repo)
-
     # Clamp pagination parameters
     page, size = clamp_pagination(page, size)
 
-    # Get products with search and pagination
-    products, total = product_repo.search_by_tenant(
-        tenant_id=tenant_id, query=q, sort=sort, order=order, page=page, size=size
-    )
+    # Pages reached via "Next" carry a cursor and seek past the previous
+    # page's last row; numbered links and malformed cursors use OFFSET
+    products = None
+    if after:
+        try:
+            products, next_cursor = product_repo.search_by_tenant_after(
+                tenant_id=tenant_id,
+                query=q,
+                sort=sort,
+                order=order,
+                size=size,
+                cursor=after,
+            )
+        except ValueError:
+            pass
 
-    # Calculate pagination info
-    total_pages = (total + size - 1) // size if total > 0 else 1
+    if products is None:
+        products, total = product_repo.search_by_tenant(
+            tenant_id=tenant_id, query=q, sort=sort, order=order, page=page, size=size
+        )
+        next_cursor = None
+        if products and page * size < total:
+            next_cursor = cursor_after(products[-1], sort)
+    elif next_cursor is None:
+        # Last page: the total follows from the page number, no COUNT needed
+        total = (page - 1) * size + len(products)
+    else:
+        total = product_repo.count_search(tenant_id=tenant_id, query=q)
 
     return templates.TemplateResponse(
         "products/index.html",
@@ -52,10 +69,10 @@ async def list_products(
             "total": total,
             "page": page,
             "size": size,
-            "total_pages": total_pages,
+            "total_pages": total_pages(total, size),
             "query": q,
             "sort": sort,
             "order": order,
-            "config": request.app.state.settings,
+            "next_cursor": next_cursor,
         },
     )
@@ -25,9 +25,15 @@ def get_tenant_repo(session: Session = Depends(get_db_session)) -> TenantReposit
 def _validate_tenant_access(
     tenant_id: int, request: Request, tenant_repo: TenantRepository
 ) -> Tenant:
-    """Validate that the tenant exists and user has access."""
-    # Check if tenant exists
-    tenant = tenant_repo.get_by_id(tenant_id)
+    """Validate that the tenant exists and user has access.
+
+    The tenant is kept on ``request.state.tenant`` so later lookups in the same
+    request reuse it instead of querying again.
+    """
+    # Check if tenant exists, reusing one already loaded for this request
+    tenant = getattr(request.state, "tenant", None)
+    if not isinstance(tenant, Tenant) or tenant.id != tenant_id:
+        tenant = tenant_repo.get_by_id(tenant_id)
     if not tenant:
         raise HTTPException(status_code=404, detail="Tenant not found")
 
@@ -42,4 +48,18 @@ def _validate_tenant_access(
             },
         )
 
+    request.state.tenant = tenant
     return tenant
+
+
+def get_validated_tenant(
+    tenant_id: int,
+    request: Request,
+    tenant_repo: TenantRepository = Depends(get_tenant_repo),
+) -> Tenant:
+    """Resolve the path's tenant with access checked, once per request.
+
+    FastAPI caches dependency results within a request, so every route and
+    sub-dependency that needs the tenant shares a single lookup.
+    """
+    return _validate_tenant_access(tenant_id, request, tenant_repo)
@@ -1,7 +1,7 @@
 """Tenant context management routes."""
 
 from fastapi import APIRouter, Depends, Form, HTTPException, Request
-from fastapi.responses import RedirectResponse
+from fastapi.responses import ORJSONResponse, RedirectResponse
 from sqlmodel import Session
 
 from ..deps import get_db_session
@@ -17,7 +17,7 @@ def get_tenant_repo(session: Session = Depends(get_db_session)) -> TenantReposit
 
 
 @router.post("/tenants/select")
-async def select_tenant(
+def select_tenant(
     request: Request,
     tenant_id: int = Form(...),
     repo: TenantRepository = Depends(get_tenant_repo),
@@ -38,7 +38,7 @@ async def select_tenant(
 
 
 @router.get("/tenants/current")
-async def get_current_tenant(
+def get_current_tenant(
     request: Request, repo: TenantRepository = Depends(get_tenant_repo)
 ):
     """Get the currently active tenant."""
@@ -63,10 +63,14 @@ async def get_current_tenant(
             },
         )
 
-    return {
-        "id": tenant.id,
-        "name": tenant.name,
-        "slug": tenant.slug,
-        "created_at": tenant.created_at.isoformat(),
-        "updated_at": tenant.updated_at.isoformat(),
-    }
+    # Returning the response directly skips jsonable_encoder; orjson writes
+    # the datetimes as ISO 8601 itself
+    return ORJSONResponse(
+        {
+            "id": tenant.id,
+            "name": tenant.name,
+            "slug": tenant.slug,
+            "created_at": tenant.created_at,
+            "updated_at": tenant.updated_at,
+        }
+    )
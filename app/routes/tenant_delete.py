@@ -2,13 +2,12 @@
 
 from fastapi import APIRouter, Depends, Form, HTTPException, Request
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
 from sqlmodel import Session
 
 from ..deps import get_db_session
 from ..repositories.tenants import TenantRepository
-
-templates = Jinja2Templates(directory="app/templates")
+from ..utils.cache import tenants_cache
+from ..utils.templating import templates
 
 router = APIRouter()
 
@@ -19,7 +18,7 @@ def get_tenant_repo(session: Session = Depends(get_db_session)) -> TenantReposit
 
 
 @router.get("/tenants/{tenant_id}/delete", response_class=HTMLResponse)
-async def confirm_delete_tenant(
+def confirm_delete_tenant(
     request: Request, tenant_id: int, repo: TenantRepository = Depends(get_tenant_repo)
 ):
     """Show delete confirmation."""
@@ -28,12 +27,12 @@ async def confirm_delete_tenant(
         raise HTTPException(status_code=404, detail="Tenant not found")
 
     return templates.TemplateResponse(
-        "tenants/confirm_delete.html", {"request": request, "tenant": tenant, "config": request.app.state.settings}
+        "tenants/confirm_delete.html", {"request": request, "tenant": tenant}
     )
 
 
 @router.post("/tenants/{tenant_id}/delete", response_class=HTMLResponse)
-async def delete_tenant(
+def delete_tenant(
     request: Request,
     tenant_id: int,
     confirmation: str = Form(...),
@@ -47,7 +46,6 @@ async def delete_tenant(
                 "request": request,
                 "tenant": repo.get_by_id(tenant_id),
                 "error": "Please type 'DELETE' to confirm deletion.",
-                "config": request.app.state.settings,
             },
             status_code=400,
         )
@@ -55,5 +53,6 @@ async def delete_tenant(
     success = repo.delete(tenant_id)
     if not success:
         raise HTTPException(status_code=404, detail="Tenant not found")
+    tenants_cache.invalidate()
 
     return RedirectResponse(url="/tenants", status_code=302)
@@ -1,17 +1,14 @@
 """Tenant management routes."""
 
-from typing import Optional
-
 from fastapi import APIRouter, Depends, Form, HTTPException, Request
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
 from sqlmodel import Session
 
 from ..deps import get_db_session
 from ..models.tenant import Tenant
-from ..repositories.tenants import TenantRepository
-
-templates = Jinja2Templates(directory="app/templates")
+from ..repositories.tenants import DuplicateSlugError, TenantRepository
+from ..utils.cache import tenants_cache
+from ..utils.templating import templates
 
 router = APIRouter()
 
@@ -21,16 +18,6 @@ def get_tenant_repo(session: Session = Depends(get_db_session)) -> TenantReposit
     return TenantRepository(session)
 
 
-def _validate_slug_uniqueness(
-    slug: str, repo: TenantRepository, exclude_id: Optional[int] = None
-) -> Optional[str]:
-    """Validate slug uniqueness and return error message if invalid."""
-    existing = repo.get_by_slug(slug)
-    if existing and (exclude_id is None or existing.id != exclude_id):
-        return f"Slug '{slug}' is already taken. Please choose a different one."
-    return None
-
-
 def _render_form_with_error(
     request: Request, tenant, action: str, error: str
 ) -> HTMLResponse:
@@ -43,18 +30,17 @@ def _render_form_with_error(
 
 
 @router.get("/tenants", response_class=HTMLResponse)
-async def list_tenants(
+def list_tenants(
     request: Request, repo: TenantRepository = Depends(get_tenant_repo)
 ):
     """List all tenants."""
-    tenants = repo.list_all()
+    tenants = repo.list_summary()
     return templates.TemplateResponse(
         "tenants/index.html",
         {
             "request": request,
             "tenants": tenants,
             "title": "Tenants - AdCP Demo Orchestrator",
-            "config": request.app.state.settings,
         },
     )
 
@@ -63,30 +49,28 @@ async def list_tenants(
 async def add_tenant_form(request: Request):
     """Show add tenant form."""
     return templates.TemplateResponse(
-        "tenants/form.html", {"request": request, "tenant": None, "action": "add", "config": request.app.state.settings}
+        "tenants/form.html", {"request": request, "tenant": None, "action": "add"}
     )
 
 
 @router.post("/tenants/add", response_class=HTMLResponse)
-async def create_tenant(
+def create_tenant(
     request: Request,
     name: str = Form(...),
     slug: str = Form(...),
     repo: TenantRepository = Depends(get_tenant_repo),
 ):
     """Create a new tenant."""
-    # Validate slug uniqueness
-    error = _validate_slug_uniqueness(slug, repo)
-    if error:
-        return _render_form_with_error(
-            request, {"name": name, "slug": slug}, "add", error
-        )
-
-    # Create tenant
+    # The slug's unique index rejects duplicates in the INSERT itself
     tenant = Tenant(name=name, slug=slug)
     try:
         repo.create(tenant)
+        tenants_cache.invalidate()
         return RedirectResponse(url="/tenants", status_code=302)
+    except DuplicateSlugError as e:
+        return _render_form_with_error(
+            request, {"name": name, "slug": slug}, "add", str(e)
+        )
     except Exception as e:
         return _render_form_with_error(
             request,
@@ -97,7 +81,7 @@ async def create_tenant(
 
 
 @router.get("/tenants/{tenant_id}/edit", response_class=HTMLResponse)
-async def edit_tenant_form(
+def edit_tenant_form(
     request: Request, tenant_id: int, repo: TenantRepository = Depends(get_tenant_repo)
 ):
     """Show edit tenant form."""
@@ -106,12 +90,12 @@ async def edit_tenant_form(
         raise HTTPException(status_code=404, detail="Tenant not found")
 
     return templates.TemplateResponse(
-        "tenants/form.html", {"request": request, "tenant": tenant, "action": "edit", "config": request.app.state.settings}
+        "tenants/form.html", {"request": request, "tenant": tenant, "action": "edit"}
     )
 
 
 @router.post("/tenants/{tenant_id}/edit", response_class=HTMLResponse)
-async def update_tenant(
+def update_tenant(
     request: Request,
     tenant_id: int,
     name: str = Form(...),
@@ -123,17 +107,16 @@ async def update_tenant(
     if not tenant:
         raise HTTPException(status_code=404, detail="Tenant not found")
 
-    # Check slug uniqueness (excluding current tenant)
-    error = _validate_slug_uniqueness(slug, repo, exclude_id=tenant_id)
-    if error:
-        return _render_form_with_error(request, tenant, "edit", error)
-
-    # Update tenant
+    # Update tenant; the slug's unique index rejects duplicates
     tenant.name = name
     tenant.slug = slug
     try:
         repo.update(tenant)
+        tenants_cache.invalidate()
         return RedirectResponse(url="/tenants", status_code=302)
+    except DuplicateSlugError as e:
+        # The rollback reloaded the tenant's saved name and slug
+        return _render_form_with_error(request, tenant, "edit", str(e))
     except Exception as e:
         return _render_form_with_error(
             request, tenant, "edit", f"Error updating tenant: {str(e)}"
@@ -1,13 +1,39 @@
 """CSV import service for Product model with validation and error reporting."""
 
 import csv
+import sys
 from datetime import datetime
 from io import StringIO
-from typing import Dict, List, Tuple, Union
+from operator import itemgetter
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 from ..models.product import Product
 from .csv_template import get_product_csv_headers
 
+# Validated products are handed to the database in chunks of this size
+CSV_CHUNK_SIZE = 1000
+
+# The template's columns never change at runtime, so build them once
+_TEMPLATE_HEADERS = tuple(get_product_csv_headers())
+_EXPECTED_HEADERS = frozenset(_TEMPLATE_HEADERS)
+
+# Accepted values for the enum-like columns, after lower-casing
+_BOOLEANS = {"true": True, "false": False}
+_DELIVERY_TYPES = frozenset(("guaranteed", "non_guaranteed"))
+_TARGETED_AGES = frozenset(("children", "teens", "adults"))
+
+
+if sys.version_info >= (3, 11):
+    # fromisoformat accepts a trailing "Z" natively from Python 3.11
+    _parse_iso_datetime = datetime.fromisoformat
+else:
+
+    def _parse_iso_datetime(value: str) -> datetime:
+        """Parse an ISO datetime, reading a trailing "Z" as UTC."""
+        if value.endswith("Z"):
+            value = value[:-1] + "+00:00"
+        return datetime.fromisoformat(value)
+
 
 class CSVImportError(Exception):
     """Exception raised when CSV import fails."""
@@ -28,6 +54,14 @@ class RowError:
         return {"row": self.row_number, "field": self.field, "message": self.message}
 
 
+class CSVRowErrors(CSVImportError):
+    """Raised once a CSV has been fully read if any row failed validation."""
+
+    def __init__(self, errors: List[RowError]):
+        super().__init__(f"CSV has {len(errors)} invalid field(s)")
+        self.errors = errors
+
+
 def validate_csv_headers(headers: List[str]) -> List[str]:
     """Validate CSV headers against expected template.
 
@@ -40,15 +74,15 @@ def validate_csv_headers(headers: List[str]) -> List[str]:
     Raises:
         CSVImportError: If headers don't match template
     """
-    expected_headers = get_product_csv_headers()
-    missing_headers = set(expected_headers) - set(headers)
-    extra_headers = set(headers) - set(expected_headers)
+    missing_headers = _EXPECTED_HEADERS.difference(headers)
+    # Usually empty: only the error path de-duplicates what it reports
+    extra_headers = [h for h in headers if h not in _EXPECTED_HEADERS]
 
     errors = []
     if missing_headers:
         errors.append(f"Missing required columns: {', '.join(sorted(missing_headers))}")
     if extra_headers:
-        errors.append(f"Unexpected columns: {', '.join(sorted(extra_headers))}")
+        errors.append(f"Unexpected columns: {', '.join(sorted(set(extra_headers)))}")
 
     if errors:
         raise CSVImportError("; ".join(errors))
@@ -56,81 +90,106 @@ def validate_csv_headers(headers: List[str]) -> List[str]:
     return []
 
 
-def validate_product_row(row: Dict[str, str], row_number: int) -> List[RowError]:
-    """Validate a single product row and return any errors.
+def process_product_row(
+    values: Tuple[str, ...], row_number: int
+) -> Tuple[Optional[Product], List[RowError]]:
+    """Validate a CSV row and build its Product in a single pass.
+
+    Each field is stripped and lower-cased once, and numbers and dates are
+    parsed once, with the parsed values reused for the Product.
 
     Args:
-        row: Dictionary of field values for the row
+        values: Field values in template column order
         row_number: 1-based row number for error reporting
 
     Returns:
-        List of RowError objects (empty if no errors)
+        Tuple of (product, errors); product is None if there are errors and
+        its tenant_id must be set separately
     """
+    (
+        product_id,
+        name,
+        description,
+        delivery_type,
+        is_fixed_price_str,
+        cpm_str,
+        is_custom_str,
+        expires_at_str,
+        policy_compliance,
+        targeted_ages,
+        min_age_str,
+    ) = values
     errors = []
 
     # Required fields
-    if not row.get("product_id", "").strip():
+    product_id = product_id.strip()
+    if not product_id:
         errors.append(
             RowError(row_number, "product_id", "Required field cannot be empty")
         )
 
-    if not row.get("name", "").strip():
+    name = name.strip()
+    if not name:
         errors.append(RowError(row_number, "name", "Required field cannot be empty"))
 
-    if not row.get("description", "").strip():
+    description = description.strip()
+    if not description:
         errors.append(
             RowError(row_number, "description", "Required field cannot be empty")
         )
 
     # Validate delivery_type
-    delivery_type = row.get("delivery_type", "").strip().lower()
-    if delivery_type not in ["guaranteed", "non_guaranteed"]:
+    delivery_type = delivery_type.strip().lower()
+    if delivery_type not in _DELIVERY_TYPES:
         errors.append(
             RowError(
                 row_number, "delivery_type", "Must be 'guaranteed' or 'non_guaranteed'"
             )
         )
 
-    # Validate is_fixed_price
-    is_fixed_price_str = row.get("is_fixed_price", "").strip().lower()
-    if is_fixed_price_str not in ["true", "false"]:
+    # Validate is_fixed_price; one lookup both checks and parses it
+    is_fixed_price = _BOOLEANS.get(is_fixed_price_str.strip().lower())
+    if is_fixed_price is None:
         errors.append(
             RowError(row_number, "is_fixed_price", "Must be 'true' or 'false'")
         )
 
-    # Validate cpm if is_fixed_price is true
-    if is_fixed_price_str == "true":
-        cpm_str = row.get("cpm", "").strip()
-        if not cpm_str:
-            errors.append(
-                RowError(row_number, "cpm", "Required when is_fixed_price is true")
-            )
+    # Validate cpm; it is required and must be positive for fixed prices
+    cpm = None
+    cpm_str = cpm_str.strip()
+    if cpm_str:
+        try:
+            cpm = float(cpm_str)
+        except ValueError:
+            errors.append(RowError(row_number, "cpm", "Must be a valid number"))
         else:
-            try:
-                cpm = float(cpm_str)
-                if cpm <= 0:
-                    errors.append(RowError(row_number, "cpm", "Must be greater than 0"))
-            except ValueError:
-                errors.append(RowError(row_number, "cpm", "Must be a valid number"))
-
-    # Validate is_custom
-    is_custom_str = row.get("is_custom", "").strip().lower()
-    if is_custom_str and is_custom_str not in ["true", "false"]:
+            if is_fixed_price and cpm <= 0:
+                errors.append(RowError(row_number, "cpm", "Must be greater than 0"))
+    elif is_fixed_price:
+        errors.append(
+            RowError(row_number, "cpm", "Required when is_fixed_price is true")
+        )
+
+    # Validate is_custom; blank means false
+    is_custom_str = is_custom_str.strip()
+    is_custom = _BOOLEANS.get(is_custom_str.lower()) if is_custom_str else False
+    if is_custom is None:
         errors.append(RowError(row_number, "is_custom", "Must be 'true' or 'false'"))
 
     # Validate expires_at if provided
-    expires_at_str = row.get("expires_at", "").strip()
+    expires_at = None
+    expires_at_str = expires_at_str.strip()
     if expires_at_str:
         try:
-            datetime.fromisoformat(expires_at_str.replace("Z", "+00:00"))
+            expires_at = _parse_iso_datetime(expires_at_str)
         except ValueError:
             errors.append(
                 RowError(row_number, "expires_at", "Must be a valid ISO datetime")
             )
 
     # Validate targeted_ages if provided
-    targeted_ages = row.get("targeted_ages", "").strip().lower()
-    if targeted_ages and targeted_ages not in ["children", "teens", "adults"]:
+    targeted_ages = targeted_ages.strip().lower()
+    if targeted_ages and targeted_ages not in _TARGETED_AGES:
         errors.append(
             RowError(
                 row_number, "targeted_ages", "Must be 'children', 'teens', or 'adults'"
@@ -138,71 +197,119 @@ def validate_product_row(row: Dict[str, str], row_number: int) -> List[RowError]
         )
 
     # Validate verified_minimum_age if provided
-    min_age_str = row.get("verified_minimum_age", "").strip()
+    verified_minimum_age = None
+    min_age_str = min_age_str.strip()
     if min_age_str:
         try:
-            min_age = int(min_age_str)
-            if min_age < 0:
-                errors.append(
-                    RowError(row_number, "verified_minimum_age", "Must be 0 or greater")
-                )
+            verified_minimum_age = int(min_age_str)
         except ValueError:
             errors.append(
                 RowError(row_number, "verified_minimum_age", "Must be a valid integer")
             )
+        else:
+            if verified_minimum_age < 0:
+                errors.append(
+                    RowError(row_number, "verified_minimum_age", "Must be 0 or greater")
+                )
 
-    return errors
+    if errors:
+        return None, errors
+
+    return (
+        Product(
+            product_id=product_id,
+            name=name,
+            description=description,
+            delivery_type=delivery_type,
+            is_fixed_price=is_fixed_price,
+            cpm=cpm,
+            is_custom=is_custom,
+            expires_at=expires_at,
+            policy_compliance=policy_compliance.strip() or None,
+            targeted_ages=targeted_ages or None,
+            verified_minimum_age=verified_minimum_age,
+        ),
+        [],
+    )
 
 
-def parse_product_row(row: Dict[str, str]) -> Product:
-    """Parse a validated CSV row into a Product object.
+def iter_product_chunks(
+    csv_lines: Iterable[str], tenant_id: int, chunk_size: int = CSV_CHUNK_SIZE
+) -> Iterator[List[Product]]:
+    """Parse CSV lines incrementally, yielding validated products in chunks.
+
+    Rows are read one at a time, so memory is bounded by ``chunk_size`` rather
+    than the size of the file. After the first invalid row no more chunks are
+    yielded, but the rest of the file is still validated so every row error
+    can be reported.
 
     Args:
-        row: Dictionary of field values for the row
+        csv_lines: Iterable of decoded CSV lines, e.g. a text stream
+        tenant_id: Tenant ID to assign to all products
+        chunk_size: Maximum number of products per yielded chunk
 
-    Returns:
-        Product object (tenant_id must be set separately)
+    Raises:
+        CSVRowErrors: After the last row, if any header or row was invalid
     """
-    # Parse boolean fields
-    is_fixed_price = row.get("is_fixed_price", "").strip().lower() == "true"
-    is_custom = row.get("is_custom", "").strip().lower() == "true"
+    errors: List[RowError] = []
+    chunk: List[Product] = []
 
-    # Parse numeric fields
-    cpm = None
-    if row.get("cpm", "").strip():
-        cpm = float(row["cpm"])
+    try:
+        # Plain rows indexed by column position; no dict is built per row
+        reader = csv.reader(csv_lines)
+        headers = next(reader, [])
 
-    verified_minimum_age = None
-    if row.get("verified_minimum_age", "").strip():
-        verified_minimum_age = int(row["verified_minimum_age"])
+        # Validate headers
+        try:
+            validate_csv_headers(headers)
+        except CSVImportError as e:
+            raise CSVRowErrors([RowError(0, "headers", str(e))]) from e
 
-    # Parse datetime field
-    expires_at = None
-    if row.get("expires_at", "").strip():
-        expires_at = datetime.fromisoformat(row["expires_at"].replace("Z", "+00:00"))
-
-    return Product(
-        product_id=row["product_id"].strip(),
-        name=row["name"].strip(),
-        description=row["description"].strip(),
-        delivery_type=row["delivery_type"].strip().lower(),
-        is_fixed_price=is_fixed_price,
-        cpm=cpm,
-        is_custom=is_custom,
-        expires_at=expires_at,
-        policy_compliance=row.get("policy_compliance", "").strip() or None,
-        targeted_ages=row.get("targeted_ages", "").strip().lower() or None,
-        verified_minimum_age=verified_minimum_age,
-    )
+        # Pick each row's fields out in template order with one C-level call
+        template_values = itemgetter(
+            *(headers.index(name) for name in _TEMPLATE_HEADERS)
+        )
+        width = len(headers)
+
+        # Process each non-blank row, numbered from 2 (1 is headers)
+        rows = (row for row in reader if row)
+        for row_number, row in enumerate(rows, start=2):
+            # Short rows read as empty trailing fields
+            if len(row) < width:
+                row += [""] * (width - len(row))
+
+            product, row_errors = process_product_row(template_values(row), row_number)
+            if row_errors:
+                errors.extend(row_errors)
+                continue
+
+            # Nothing will be imported once a row has failed
+            if errors:
+                continue
+
+            product.tenant_id = tenant_id
+            chunk.append(product)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+    except (csv.Error, ValueError) as e:
+        errors = [RowError(0, "general", f"Failed to parse CSV: {str(e)}")]
+
+    # If any errors, the caller must discard what was yielded (no partial imports)
+    if errors:
+        raise CSVRowErrors(errors)
+
+    if chunk:
+        yield chunk
 
 
 def parse_csv_content(
-    csv_content: str, tenant_id: int
+    csv_lines: Union[str, Iterable[str]], tenant_id: int
 ) -> Tuple[List[Product], List[RowError]]:
     """Parse CSV content and validate all rows.
 
     Args:
-        csv_content: CSV file content as string
+        csv_lines: CSV content as a string or an iterable of decoded lines
         tenant_id: Tenant ID to assign to all products
 
     Returns:
@@ -211,43 +318,27 @@ def parse_csv_content(
     Note:
         If any row has errors, no products are returned (no partial imports)
     """
-    errors = []
-    products = []
-
-    try:
-        # Parse CSV
-        csv_file = StringIO(csv_content)
-        reader = csv.DictReader(csv_file)
-
-        # Validate headers
+    if isinstance(csv_lines, str):
+        # Reject bad headers before copying the whole content into a StringIO
+        end = csv_lines.find("\n")
+        header_line = csv_lines if end < 0 else csv_lines[:end]
         try:
-            validate_csv_headers(reader.fieldnames or [])
+            validate_csv_headers(next(csv.reader([header_line]), []))
         except CSVImportError as e:
             return [], [RowError(0, "headers", str(e))]
+        except csv.Error:
+            pass  # Left for the full parse to report
+        csv_lines = StringIO(csv_lines)
 
-        # Process each row
-        for row_number, row in enumerate(reader, start=2):  # Start at 2 (1 is headers)
-            # Validate row
-            row_errors = validate_product_row(row, row_number)
-            if row_errors:
-                errors.extend(row_errors)
-                continue
-
-            # Parse row
-            try:
-                product = parse_product_row(row)
-                product.tenant_id = tenant_id
-                products.append(product)
-            except Exception as e:
-                errors.append(
-                    RowError(row_number, "general", f"Failed to parse row: {str(e)}")
-                )
-
-        # If any errors, return no products (no partial imports)
-        if errors:
-            return [], errors
-
-        return products, []
-
+    try:
+        products = [
+            product
+            for chunk in iter_product_chunks(csv_lines, tenant_id)
+            for product in chunk
+        ]
+    except CSVRowErrors as e:
+        return [], e.errors
     except Exception as e:
         return [], [RowError(0, "general", f"Failed to parse CSV: {str(e)}")]
+
+    return products, []
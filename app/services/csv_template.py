@@ -6,6 +6,7 @@ Based on AdCP Product specification from:
 """
 
 import csv
+from functools import lru_cache
 from io import StringIO
 from typing import List
 
@@ -35,9 +36,12 @@ def get_product_csv_headers() -> List[str]:
     ]
 
 
+@lru_cache(maxsize=None)
 def generate_csv_template() -> str:
     """Generate a CSV template with headers and example row.
 
+    The template never varies, so it is built once and then served from cache.
+
     Returns:
         CSV string with headers and one example row
     """
@@ -0,0 +1,51 @@
+"""Lazy tenant context for pages that render the navbar tenant switcher."""
+
+from typing import Any, List, Optional, Tuple
+
+from fastapi import Request
+
+from ..db import get_session
+from ..repositories.tenants import TenantRepository
+from ..utils.cache import TENANTS_CACHE_KEY, tenants_cache
+from ..utils.cookies import get_active_tenant_id
+from ..utils.logging import get_logger
+
+logger = get_logger("navbar")
+
+
+def load_navbar_context(request: Request) -> Tuple[Optional[Any], List[Any]]:
+    """Return (active_tenant, tenants) for the navbar, loading on first use.
+
+    Only routes that render the navbar call this, so health checks, static
+    files, and JSON APIs never touch the database for tenant context. The
+    result is memoized on request.state for the rest of the request.
+    """
+    if hasattr(request.state, "tenants"):
+        return request.state.active_tenant, request.state.tenants
+
+    # Get active tenant from cookie
+    tenant_id = get_active_tenant_id(request)
+    active_tenant = None
+    tenants_list = []
+
+    try:
+        # Load all tenants for navbar in one query, then pick the active one
+        tenants_list = tenants_cache.get(TENANTS_CACHE_KEY)
+        if tenants_list is None:
+            with get_session() as session:
+                repo = TenantRepository(session)
+                tenants_list = repo.list_minimal()
+            tenants_cache.set(TENANTS_CACHE_KEY, tenants_list)
+
+        if tenant_id:
+            active_tenant = next(
+                (tenant for tenant in tenants_list if tenant.id == tenant_id), None
+            )
+    except Exception as e:
+        # If database is not ready, continue without tenant context
+        logger.warning(f"Database error loading tenant context: {e}")
+
+    # Add to request state
+    request.state.active_tenant = active_tenant
+    request.state.tenants = tenants_list
+    return active_tenant, tenants_list
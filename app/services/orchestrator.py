@@ -3,9 +3,11 @@
 import asyncio
 import time
 import uuid
+import weakref
 from typing import Any, Dict, List, Optional
 
 import httpx
+import orjson
 
 from ..config import settings
 
@@ -18,37 +20,64 @@ class CircuitBreaker:
 
     def should_skip(self, agent_key: str) -> bool:
         """Check if agent should be skipped due to circuit breaker."""
-        if agent_key not in self.failures:
+        failure_info = self.failures.get(agent_key)
+        if failure_info is None:
+            return False
+        if failure_info["count"] < settings.cb_failure_threshold:
             return False
 
-        failure_info = self.failures[agent_key]
-        if failure_info["count"] >= settings.cb_failure_threshold:
-            # Check if still within TTL
-            if time.time() - failure_info["last_failure"] < settings.cb_ttl_seconds:
-                return True
-            else:
-                # TTL expired, reset
-                del self.failures[agent_key]
+        # Check if still within TTL
+        if time.time() - failure_info["last_failure"] < settings.cb_ttl_seconds:
+            return True
+
+        # TTL expired, reset
+        del self.failures[agent_key]
         return False
 
     def record_failure(self, agent_key: str) -> None:
         """Record a failure for the agent."""
         now = time.time()
-        if agent_key in self.failures:
-            self.failures[agent_key]["count"] += 1
-            self.failures[agent_key]["last_failure"] = now
-        else:
+        failure_info = self.failures.get(agent_key)
+        if failure_info is None:
             self.failures[agent_key] = {"count": 1, "last_failure": now}
+        else:
+            failure_info["count"] += 1
+            failure_info["last_failure"] = now
 
     def record_success(self, agent_key: str) -> None:
         """Record a success, resetting failure count."""
-        if agent_key in self.failures:
-            del self.failures[agent_key]
+        self.failures.pop(agent_key, None)
 
 
 # Global circuit breaker instance
 circuit_breaker = CircuitBreaker()
 
+# One pooled agent client per event loop; its connections are bound to the loop
+_agent_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_agent_client() -> httpx.AsyncClient:
+    """Return the running loop's shared client, so agent calls reuse connections."""
+    loop = asyncio.get_running_loop()
+    client = _agent_clients.get(loop)
+    if client is None or client.is_closed:
+        client = _agent_clients[loop] = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=100, max_keepalive_connections=100, keepalive_expiry=30
+            ),
+            headers={"Content-Type": "application/json"},
+        )
+    return client
+
+
+async def close_agent_client() -> None:
+    """Close the running loop's shared agent client, if one was opened."""
+    client = _agent_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
 
 def build_adcp_request(brief: str, context_id: Optional[str] = None) -> Dict[str, Any]:
     """Build AdCP-compliant request body for ranking."""
@@ -67,8 +96,7 @@ def validate_adcp_response(response_data: Dict[str, Any]) -> bool:
     # Check for error response
     if "error" in response_data:
         error = response_data["error"]
-        required_error_fields = ["type", "message"]
-        return all(field in error for field in required_error_fields)
+        return "type" in error and "message" in error
 
     # Check for success response with items
     if "items" not in response_data:
@@ -78,20 +106,33 @@ def validate_adcp_response(response_data: Dict[str, Any]) -> bool:
     if not isinstance(items, list):
         return False
 
-    # Validate each item has required fields
+    # Validate each item has string product_id and reason fields; a missing
+    # key reads as None and fails the type check, so each field is one lookup
     for item in items:
         if not isinstance(item, dict):
             return False
-        if "product_id" not in item or "reason" not in item:
+        if not isinstance(item.get("product_id"), str):
             return False
-        if not isinstance(item["product_id"], str) or not isinstance(
-            item["reason"], str
-        ):
+        if not isinstance(item.get("reason"), str):
             return False
 
     return True
 
 
+def _agent_error(response: httpx.Response) -> Optional[Dict[str, Any]]:
+    """Return the AdCP error object from a non-200 response body, if it has one."""
+    try:
+        response_data = response.json()
+    except ValueError:
+        return None
+    if not isinstance(response_data, dict):
+        return None
+    error = response_data.get("error")
+    if isinstance(error, dict) and validate_adcp_response(response_data):
+        return error
+    return None
+
+
 async def call_agent(
     agent_url: str, brief: str, timeout_ms: int, context_id: Optional[str] = None
 ) -> Dict[str, Any]:
@@ -99,45 +140,39 @@ async def call_agent(
     start_time = time.time()
 
     try:
-        async with httpx.AsyncClient() as client:
-            request_body = build_adcp_request(brief, context_id)
+        client = get_agent_client()
+        request_body = build_adcp_request(brief, context_id)
 
-            response = await client.post(
+        # httpx's timeout bounds each connect/read separately; wait_for
+        # caps the whole call so a trickling agent cannot exceed the budget
+        response = await asyncio.wait_for(
+            client.post(
                 agent_url,
-                json=request_body,
+                # The shared client already sends the JSON Content-Type
+                content=orjson.dumps(request_body),
                 timeout=timeout_ms / 1000.0,
-                headers={"Content-Type": "application/json"},
-            )
+            ),
+            timeout=timeout_ms / 1000.0,
+        )
 
-            duration_ms = int((time.time() - start_time) * 1000)
-
-            if response.status_code == 200:
-                response_data = response.json()
-                if validate_adcp_response(response_data):
-                    # Check if it's an error response
-                    if "error" in response_data:
-                        return {
-                            "success": False,
-                            "error": response_data["error"],
-                            "duration_ms": duration_ms,
-                            "status_code": response.status_code,
-                        }
-                    else:
-                        # Success response with items
-                        return {
-                            "success": True,
-                            "data": response_data,
-                            "duration_ms": duration_ms,
-                            "status_code": response.status_code,
-                        }
-                else:
+        duration_ms = int((time.time() - start_time) * 1000)
+
+        if response.status_code == 200:
+            response_data = response.json()
+            if validate_adcp_response(response_data):
+                # Check if it's an error response
+                if "error" in response_data:
                     return {
                         "success": False,
-                        "error": {
-                            "type": "invalid_response",
-                            "message": "Agent response does not match AdCP contract",
-                            "status": response.status_code,
-                        },
+                        "error": response_data["error"],
+                        "duration_ms": duration_ms,
+                        "status_code": response.status_code,
+                    }
+                else:
+                    # Success response with items
+                    return {
+                        "success": True,
+                        "data": response_data,
                         "duration_ms": duration_ms,
                         "status_code": response.status_code,
                     }
@@ -145,15 +180,28 @@ async def call_agent(
                 return {
                     "success": False,
                     "error": {
-                        "type": "http",
-                        "message": f"HTTP {response.status_code}: {response.text}",
+                        "type": "invalid_response",
+                        "message": "Agent response does not match AdCP contract",
                         "status": response.status_code,
                     },
                     "duration_ms": duration_ms,
                     "status_code": response.status_code,
                 }
-
-    except httpx.TimeoutException:
+        else:
+            # Internal agents explain failures with an AdCP error body; keep it
+            return {
+                "success": False,
+                "error": _agent_error(response)
+                or {
+                    "type": "http",
+                    "message": f"HTTP {response.status_code}: {response.text}",
+                    "status": response.status_code,
+                },
+                "duration_ms": duration_ms,
+                "status_code": response.status_code,
+            }
+
+    except (httpx.TimeoutException, asyncio.TimeoutError):
         duration_ms = int((time.time() - start_time) * 1000)
         return {
             "success": False,
@@ -258,38 +306,39 @@ async def orchestrate(
                 }
             )
 
-    # Execute calls concurrently
+    # Execute calls concurrently; each records its breaker outcome as soon as
+    # it finishes rather than when the whole batch does
     semaphore = asyncio.Semaphore(settings.orch_concurrency)
 
     async def call_with_semaphore(call_info: Dict[str, Any]) -> Dict[str, Any]:
         async with semaphore:
-            if "url" in call_info:
-                result = await call_agent(
-                    call_info["url"], brief, timeout_ms, context_id
-                )
-
-                agent_key = call_info["agent_key"]
-                if result["success"]:
-                    circuit_breaker.record_success(agent_key)
-                    return {
-                        "agent": call_info["agent"],
-                        "items": result["data"].get("items", []),
-                        "error": None,
-                    }
-                else:
-                    circuit_breaker.record_failure(agent_key)
-                    return {
-                        "agent": call_info["agent"],
-                        "items": [],
-                        "error": result["error"],
-                    }
-            else:
-                # Circuit breaker result
-                return call_info
+            result = await call_agent(call_info["url"], brief, timeout_ms, context_id)
+
+        agent_key = call_info["agent_key"]
+        if result["success"]:
+            circuit_breaker.record_success(agent_key)
+            return {
+                "agent": call_info["agent"],
+                "items": result["data"].get("items", []),
+                "error": None,
+            }
+        circuit_breaker.record_failure(agent_key)
+        return {
+            "agent": call_info["agent"],
+            "items": [],
+            "error": result["error"],
+        }
 
-    # Execute all calls
-    tasks = [call_with_semaphore(call_info) for call_info in agent_calls]
-    results = await asyncio.gather(*tasks)
+    # Breaker-skipped agents are already final and never wait for a slot;
+    # only live calls are scheduled, and results keep the request's order
+    results = list(agent_calls)
+    pending = [i for i, call_info in enumerate(agent_calls) if "url" in call_info]
+    if pending:
+        outcomes = await asyncio.gather(
+            *(call_with_semaphore(agent_calls[i]) for i in pending)
+        )
+        for i, outcome in zip(pending, outcomes):
+            results[i] = outcome
 
     return {
         "results": results,
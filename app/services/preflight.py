@@ -2,8 +2,9 @@
 
 import os
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any
+from typing import Any, Dict
 
 from ..config import settings
 
@@ -52,9 +53,10 @@ def check_database_file() -> Dict[str, Any]:
 def check_database_tables() -> Dict[str, Any]:
     """Check if required database tables exist."""
     try:
-        from ..db import get_engine
         from sqlalchemy import text
 
+        from ..db import get_engine
+
         engine = get_engine()
 
         with engine.connect() as conn:
@@ -180,17 +182,23 @@ def check_tenants() -> Dict[str, Any]:
 
 
 def run_checks() -> Dict[str, Dict[str, Any]]:
-    """Run all preflight checks and return results."""
+    """Run all preflight checks and return results.
+
+    The checks are independent blocking I/O, so they run in parallel threads;
+    results keep the order the checks are listed in.
+    """
     checks = {
-        "database_file": check_database_file(),
-        "database_tables": check_database_tables(),
-        "reference_repositories": check_reference_repositories(),
-        "default_prompt_file": check_default_prompt_file(),
-        "api_key": check_api_key(),
-        "tenants": check_tenants(),
+        "database_file": check_database_file,
+        "database_tables": check_database_tables,
+        "reference_repositories": check_reference_repositories,
+        "default_prompt_file": check_default_prompt_file,
+        "api_key": check_api_key,
+        "tenants": check_tenants,
     }
 
-    return checks
+    with ThreadPoolExecutor(max_workers=len(checks)) as executor:
+        futures = {name: executor.submit(check) for name, check in checks.items()}
+        return {name: future.result() for name, future in futures.items()}
 
 
 def get_overall_status(checks: Dict[str, Dict[str, Any]]) -> str:
@@ -209,3 +217,13 @@ def get_status_summary(checks: Dict[str, Dict[str, Any]]) -> Dict[str, int]:
     for check in checks.values():
         summary[check["status"]] += 1
     return summary
+
+
+def build_preflight_report() -> Dict[str, Any]:
+    """Run all checks and derive the overall status and summary from them."""
+    checks = run_checks()
+    return {
+        "overall_status": get_overall_status(checks),
+        "summary": get_status_summary(checks),
+        "checks": checks,
+    }
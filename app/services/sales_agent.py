@@ -1,11 +1,13 @@
 """Sales agent service for evaluating buyer briefs against products."""
 
 import os
-from typing import Any, Dict, List
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
+
+from starlette.concurrency import run_in_threadpool
 
 from ..ai.errors import AIConfigError, AIRequestError, AITimeoutError
-from ..ai.provider import get_default_provider, register_provider
-from ..ai.gemini import GeminiProvider
+from ..ai.provider import get_default_provider
 from ..models.agent_settings import AgentSettings
 from ..models.product import Product
 from ..repositories.agent_settings import AgentSettingsRepository
@@ -37,7 +39,11 @@ def product_to_dict(product: Product) -> Dict[str, Any]:
 
 
 def load_default_prompt() -> str:
-    """Load the default sales agent prompt from file."""
+    """Load the default sales agent prompt from file.
+
+    The file is read once per modification time, so edits are still picked
+    up without a restart but unchanged requests skip the read.
+    """
     prompt_path = "app/resources/default_sales_prompt.txt"
 
     if not os.path.exists(prompt_path):
@@ -47,12 +53,49 @@ def load_default_prompt() -> str:
         )
 
     try:
-        with open(prompt_path, "r", encoding="utf-8") as f:
-            return f.read().strip()
+        return _read_prompt(prompt_path, os.stat(prompt_path).st_mtime_ns)
     except Exception as e:
         raise AIConfigError(f"Failed to load default prompt: {e}")
 
 
+@lru_cache(maxsize=1)
+def _read_prompt(prompt_path: str, mtime_ns: int) -> str:
+    """Read a prompt file; cached on its path and mtime."""
+    with open(prompt_path, "r", encoding="utf-8") as f:
+        return f.read().strip()
+
+
+def _load_ranking_inputs(
+    tenant_id: int,
+    agent_settings_repo: AgentSettingsRepository,
+    product_repo: ProductRepository,
+) -> Tuple[AgentSettings, List[Dict[str, Any]], str]:
+    """Load what a ranking call needs from the database and disk (blocking)."""
+    # 1. Load AgentSettings for tenant
+    agent_settings = agent_settings_repo.get_by_tenant(tenant_id)
+    if not agent_settings:
+        # Create default settings
+        agent_settings = agent_settings_repo.upsert_for_tenant(
+            tenant_id, model_name="gemini-1.5-pro", timeout_ms=30000
+        )
+
+    # 2. Load tenant's products, converting each batch as it streams in
+    product_dicts = [product_to_dict(p) for p in product_repo.list_by_tenant(tenant_id)]
+    if not product_dicts:
+        raise AIConfigError(
+            f"No products found for tenant {tenant_id}. "
+            "Please add products before using AI evaluation."
+        )
+
+    # 3. Choose prompt: tenant override or default
+    if agent_settings.prompt_override:
+        prompt = agent_settings.prompt_override
+    else:
+        prompt = load_default_prompt()
+
+    return agent_settings, product_dicts, prompt
+
+
 async def evaluate_brief(
     tenant_id: int,
     brief: str,
@@ -79,32 +122,12 @@ async def evaluate_brief(
         AIRequestError: If AI request fails
         AITimeoutError: If AI request times out
     """
-    # 1. Load AgentSettings for tenant
-    agent_settings = agent_settings_repo.get_by_tenant(tenant_id)
-    if not agent_settings:
-        # Create default settings
-        agent_settings = agent_settings_repo.upsert_for_tenant(
-            tenant_id, model_name="gemini-1.5-pro", timeout_ms=30000
-        )
-
-    # 2. Load tenant's products
-    products = product_repo.list_by_tenant(tenant_id)
-    if not products:
-        raise AIConfigError(
-            f"No products found for tenant {tenant_id}. "
-            "Please add products before using AI evaluation."
-        )
+    # 1-3. Load settings, products and prompt off the event loop
+    agent_settings, product_dicts, prompt = await run_in_threadpool(
+        _load_ranking_inputs, tenant_id, agent_settings_repo, product_repo
+    )
 
-    # 3. Choose prompt: tenant override or default
-    if agent_settings.prompt_override:
-        prompt = agent_settings.prompt_override
-    else:
-        prompt = load_default_prompt()
-
-    # 4. Convert products to dict format
-    product_dicts = [product_to_dict(p) for p in products]
-
-    # 5. Get AI provider and call it
+    # 4. Get AI provider and call it
     try:
         provider = get_default_provider()
         ranked_products = await provider.rank_products(
@@ -124,16 +147,3 @@ async def evaluate_brief(
         # Convert other errors to AIRequestError
         raise AIRequestError(f"Unexpected error during AI evaluation: {e}")
 
-
-# Initialize AI providers on module import
-def _initialize_providers():
-    """Initialize AI providers."""
-    try:
-        gemini_provider = GeminiProvider()
-        register_provider("gemini", gemini_provider)
-    except AIConfigError:
-        # Gemini not configured, skip registration
-        pass
-
-
-_initialize_providers()
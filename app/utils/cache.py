@@ -0,0 +1,65 @@
+"""In-process TTL cache for rarely changing lookups."""
+
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+
+class TTLCache:
+    """Simple in-memory cache whose entries expire after a fixed TTL.
+
+    When max_entries is set, the oldest entry is evicted to make room. Lookups
+    run from threadpool workers too, so every access holds a lock.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: Optional[int] = None):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.entries: Dict[Any, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Any) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired."""
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+
+            stored_at, value = entry
+            if time.monotonic() - stored_at >= self.ttl_seconds:
+                del self.entries[key]
+                return None
+            return value
+
+    def set(self, key: Any, value: Any) -> None:
+        """Store a value under key."""
+        with self._lock:
+            # Re-insert so dict order tracks write age for eviction
+            self.entries.pop(key, None)
+            if self.max_entries is not None and len(self.entries) >= self.max_entries:
+                del self.entries[next(iter(self.entries))]
+            self.entries[key] = (time.monotonic(), value)
+
+    def invalidate(self, key: Optional[Any] = None) -> None:
+        """Drop one entry, or every entry when no key is given."""
+        with self._lock:
+            if key is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(key, None)
+
+
+# Tenant lists (navbar rows, buyer page models), refreshed at most every 30s
+# or on tenant writes
+TENANTS_CACHE_KEY = "all_tenants"
+BUYER_TENANTS_CACHE_KEY = "buyer_tenants"
+tenants_cache = TTLCache(ttl_seconds=30)
+
+# Enabled external agents for the buyer page, refreshed at most every 30s or on
+# external agent writes
+EXTERNAL_AGENTS_CACHE_KEY = "enabled_external_agents"
+external_agents_cache = TTLCache(ttl_seconds=30)
+
+# Preflight report for polling dashboards, re-run at most every 10s
+PREFLIGHT_CACHE_KEY = "preflight_report"
+preflight_cache = TTLCache(ttl_seconds=10)
@@ -0,0 +1,42 @@
+"""Conditional GET support for small, rarely changing JSON payloads."""
+
+import hashlib
+from typing import Any, NamedTuple
+
+import orjson
+from fastapi import Request, Response
+
+
+class JSONSnapshot(NamedTuple):
+    """A payload serialized once, with the strong ETag of its bytes."""
+
+    body: bytes
+    etag: str
+
+
+def json_snapshot(payload: Any) -> JSONSnapshot:
+    """Serialize ``payload`` and derive its ETag from the serialized bytes."""
+    body = orjson.dumps(payload)
+    return JSONSnapshot(body=body, etag=f'"{hashlib.sha1(body).hexdigest()}"')
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check whether the request's If-None-Match already names ``etag``."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return etag in (tag.strip() for tag in header.split(","))
+
+
+def conditional_json_response(
+    request: Request, snapshot: JSONSnapshot, max_age: int
+) -> Response:
+    """Reply 304 if the client already holds ``snapshot``, else send its body."""
+    headers = {"ETag": snapshot.etag, "Cache-Control": f"public, max-age={max_age}"}
+    if etag_matches(request, snapshot.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(
+        content=snapshot.body, media_type="application/json", headers=headers
+    )
@@ -0,0 +1,104 @@
+"""SQLite FTS5 index backing product text search."""
+
+import logging
+import weakref
+from typing import Optional
+
+from sqlalchemy import Integer, column, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.sql.selectable import TextualSelect
+from sqlmodel import Session
+
+logger = logging.getLogger(__name__)
+
+# Trigram tokens keep the old LIKE '%q%' substring semantics, case-insensitively
+MIN_FTS_QUERY_LENGTH = 3
+
+# External-content table: the index stores only tokens, product holds the text
+_CREATE_PRODUCT_FTS = (
+    "CREATE VIRTUAL TABLE product_fts USING fts5("
+    "name, description, content='product', content_rowid='id', tokenize='trigram')"
+)
+_REBUILD_PRODUCT_FTS = "INSERT INTO product_fts(product_fts) VALUES ('rebuild')"
+_PRODUCT_FTS_TRIGGERS = (
+    """CREATE TRIGGER IF NOT EXISTS product_fts_ai AFTER INSERT ON product BEGIN
+        INSERT INTO product_fts(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS product_fts_ad AFTER DELETE ON product BEGIN
+        INSERT INTO product_fts(product_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS product_fts_au
+    AFTER UPDATE OF name, description ON product BEGIN
+        INSERT INTO product_fts(product_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO product_fts(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END""",
+)
+
+# Whether each engine's database has the index, checked once per engine
+_fts_enabled: "weakref.WeakKeyDictionary[Engine, bool]" = weakref.WeakKeyDictionary()
+
+
+def _has_product_fts(conn) -> bool:
+    row = conn.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'product_fts'"
+    ).first()
+    return row is not None
+
+
+def ensure_product_fts(engine: Engine) -> bool:
+    """Create the product FTS index and its sync triggers if missing.
+
+    Returns:
+        True if the index is available, False if the database lacks FTS5
+    """
+    if engine.dialect.name != "sqlite":
+        _fts_enabled[engine] = False
+        return False
+
+    try:
+        with engine.begin() as conn:
+            if not _has_product_fts(conn):
+                conn.exec_driver_sql(_CREATE_PRODUCT_FTS)
+                conn.exec_driver_sql(_REBUILD_PRODUCT_FTS)
+            for trigger in _PRODUCT_FTS_TRIGGERS:
+                conn.exec_driver_sql(trigger)
+    except OperationalError as e:
+        logger.warning(f"FTS5 unavailable, product search will use LIKE: {e}")
+        _fts_enabled[engine] = False
+        return False
+
+    _fts_enabled[engine] = True
+    return True
+
+
+def product_fts_enabled(session: Session) -> bool:
+    """Check whether the session's database has the product FTS index."""
+    engine = session.get_bind()
+    enabled = _fts_enabled.get(engine)
+    if enabled is None:
+        enabled = engine.dialect.name == "sqlite" and _has_product_fts(
+            session.connection()
+        )
+        _fts_enabled[engine] = enabled
+    return enabled
+
+
+def product_fts_matches(query: str) -> Optional[TextualSelect]:
+    """Select the ids of products matching ``query``, or None if too short.
+
+    The query is matched as a single quoted phrase so user input is never
+    parsed as FTS5 query syntax.
+    """
+    if len(query) < MIN_FTS_QUERY_LENGTH:
+        return None
+    phrase = '"' + query.replace('"', '""') + '"'
+    return (
+        text("SELECT rowid FROM product_fts WHERE product_fts MATCH :fts_phrase")
+        .bindparams(fts_phrase=phrase)
+        .columns(column("rowid", Integer))
+    )
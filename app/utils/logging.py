@@ -2,74 +2,86 @@
 
 import logging
 import sys
-from typing import Optional
+from contextvars import ContextVar, Token
 
+import orjson
 
-def configure_logging(level: str = "INFO") -> None:
-    """Configure structured logging with request IDs."""
-    # Create formatter
-    formatter = logging.Formatter(
-        fmt='{"ts": "%(asctime)s", "level": "%(levelname)s", "msg": "%(message)s", "request_id": "%(request_id)s"}',
-        datefmt="%Y-%m-%d %H:%M:%S",
-    )
+NO_REQUEST_ID = "no-request-id"
 
-    # Create handler
-    handler = logging.StreamHandler(sys.stdout)
-    handler.setFormatter(formatter)
+# Set per request by the HTTP middleware; tasks and threadpool calls inherit it
+_request_id_var: ContextVar[str] = ContextVar("request_id", default=NO_REQUEST_ID)
 
-    # Configure root logger
-    root_logger = logging.getLogger()
-    root_logger.setLevel(getattr(logging, level.upper()))
-    root_logger.addHandler(handler)
 
-    # Remove existing handlers to avoid duplicates
-    for existing_handler in root_logger.handlers[:-1]:
-        root_logger.removeHandler(existing_handler)
+def set_request_id(request_id: str) -> Token:
+    """Tag log records in the current context with ``request_id``."""
+    return _request_id_var.set(request_id)
 
 
-class RequestIdFilter(logging.Filter):
-    """Add request_id to log records."""
+def reset_request_id(token: Token) -> None:
+    """Restore the request ID that was current before ``set_request_id``."""
+    _request_id_var.reset(token)
 
-    def __init__(self, request_id: Optional[str] = None):
-        super().__init__()
-        self.request_id = request_id or "no-request-id"
+
+class RequestIdFilter(logging.Filter):
+    """Add the current context's request_id to log records."""
 
     def filter(self, record):
-        record.request_id = self.request_id
+        record.request_id = _request_id_var.get()
         return True
 
 
-def get_logger(name: str, request_id: Optional[str] = None) -> logging.Logger:
-    """Get a logger with request ID filter."""
-    logger = logging.getLogger(name)
+class JSONFormatter(logging.Formatter):
+    """Render each record as one JSON object per line."""
 
-    if request_id:
-        # Remove existing request ID filters
-        logger.filters = [
-            f for f in logger.filters if not isinstance(f, RequestIdFilter)
-        ]
-        # Add new request ID filter
-        logger.addFilter(RequestIdFilter(request_id))
+    def format(self, record):
+        entry = {
+            "ts": self.formatTime(record, self.datefmt),
+            "level": record.levelname,
+            "msg": record.getMessage(),
+            "request_id": getattr(record, "request_id", NO_REQUEST_ID),
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return orjson.dumps(entry).decode()
 
-    return logger
+
+def _build_handler() -> logging.Handler:
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(JSONFormatter(datefmt="%Y-%m-%d %H:%M:%S"))
+    # On the handler, so records propagated from every named logger get an ID
+    handler.addFilter(RequestIdFilter())
+    return handler
 
 
-# Configure default logging without request_id for non-request contexts
+def configure_logging(level: str = "INFO") -> None:
+    """Configure structured logging with request IDs."""
+    handler = _build_handler()
+
+    # Configure root logger
+    root_logger = logging.getLogger()
+    root_logger.setLevel(getattr(logging, level.upper()))
+    root_logger.addHandler(handler)
+
+    # Remove existing handlers to avoid duplicates
+    for existing_handler in root_logger.handlers[:-1]:
+        root_logger.removeHandler(existing_handler)
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Get a logger; records carry the current request's ID when one is set."""
+    return logging.getLogger(name)
+
+
+# Configure default logging for non-request contexts
 def configure_default_logging(level: str = "INFO") -> None:
     """Configure default logging for non-request contexts."""
-    formatter = logging.Formatter(
-        fmt='{"ts": "%(asctime)s", "level": "%(levelname)s", "msg": "%(message)s", "request_id": "no-request-id"}',
-        datefmt="%Y-%m-%d %H:%M:%S",
-    )
-
-    handler = logging.StreamHandler(sys.stdout)
-    handler.setFormatter(formatter)
+    handler = _build_handler()
 
     root_logger = logging.getLogger()
     root_logger.setLevel(getattr(logging, level.upper()))
 
     # Clear existing handlers
-    for handler in root_logger.handlers[:]:
-        root_logger.removeHandler(handler)
+    for existing_handler in root_logger.handlers[:]:
+        root_logger.removeHandler(existing_handler)
 
     root_logger.addHandler(handler)
@@ -1,6 +1,10 @@
 """Pagination utilities for handling page and size parameters."""
 
-from typing import Tuple
+import base64
+import binascii
+from typing import Any, Tuple
+
+import orjson
 
 
 def clamp_pagination(page: int, size: int, max_size: int = 100) -> Tuple[int, int]:
@@ -34,3 +38,51 @@ def get_offset(page: int, size: int) -> int:
         Offset for SQL LIMIT/OFFSET
     """
     return (page - 1) * size
+
+
+def total_pages(total: int, size: int) -> int:
+    """Calculate the number of pages needed for ``total`` items (at least 1).
+
+    Args:
+        total: Total number of items
+        size: Items per page
+
+    Returns:
+        Page count, 1 when there are no items
+    """
+    return max(1, -(-total // size))
+
+
+def encode_cursor(sort_value: Any, last_id: int) -> str:
+    """Encode a keyset position as an opaque URL-safe cursor.
+
+    Args:
+        sort_value: Sort column value of the last row on the page
+        last_id: ID of the last row on the page
+
+    Returns:
+        Base64-encoded JSON cursor
+    """
+    payload = orjson.dumps([sort_value, last_id])
+    return base64.urlsafe_b64encode(payload).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, int]:
+    """Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Opaque cursor string
+
+    Returns:
+        Tuple of (sort_value, last_id)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        sort_value, last_id = orjson.loads(base64.urlsafe_b64decode(cursor))
+    except (TypeError, ValueError, binascii.Error) as e:
+        raise ValueError(f"Invalid pagination cursor: {cursor!r}") from e
+    if not isinstance(last_id, int):
+        raise ValueError(f"Invalid pagination cursor: {cursor!r}")
+    return sort_value, last_id
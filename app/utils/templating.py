@@ -0,0 +1,46 @@
+"""Shared Jinja2 template environment for all routes."""
+
+from pathlib import Path
+
+from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+from ..config import settings
+
+# Compiled template bytecode survives restarts; entries are keyed by source
+# checksum so edited templates are recompiled automatically
+JINJA_CACHE_DIR = Path("./data/.jinja_cache")
+
+
+def create_templates() -> Jinja2Templates:
+    """Create the template renderer with a persistent bytecode cache."""
+    JINJA_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
+    env = Environment(
+        loader=FileSystemLoader("app/templates"),
+        autoescape=True,
+        bytecode_cache=FileSystemBytecodeCache(str(JINJA_CACHE_DIR)),
+        # The template set is small and fixed: never evict a compiled template
+        cache_size=-1,
+        # Skip per-render mtime checks outside debug mode
+        auto_reload=settings.debug,
+    )
+    # Settings are process-wide, so templates read them as a global instead
+    # of every route passing them in its context
+    env.globals["config"] = settings
+    return Jinja2Templates(env=env)
+
+
+def warm_templates(renderer: Jinja2Templates) -> int:
+    """Compile every template up front so no request pays the parse cost.
+
+    Returns:
+        Number of templates loaded into the environment cache
+    """
+    names = renderer.env.list_templates(extensions=["html"])
+    for name in names:
+        renderer.env.get_template(name)
+    return len(names)
+
+
+templates = create_templates()
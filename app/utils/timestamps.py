@@ -0,0 +1,12 @@
+"""Timestamp helpers shared by models and repositories."""
+
+from datetime import datetime, timezone
+
+
+def utc_now() -> datetime:
+    """Return the current UTC time as a naive datetime.
+
+    Naive values match what SQLite returns for existing rows and for
+    CURRENT_TIMESTAMP server defaults, so comparisons stay consistent.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
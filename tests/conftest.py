@@ -2,12 +2,14 @@
 
 import os
 import tempfile
+from contextlib import contextmanager
 
 import pytest
-from sqlalchemy import text
+from sqlalchemy import event
 from sqlmodel import Session
 
 from app.db import get_engine, init_db
+from app.utils.cache import external_agents_cache, preflight_cache, tenants_cache
 
 
 @pytest.fixture(scope="session")
@@ -48,9 +50,27 @@ def setup_test_db(test_db_url):
         pass
 
 
+# Children before parents, so foreign keys never block a delete
+_CLEARED_TABLES = ("product", "externalagent", "agentsettings", "tenant")
+
+
+def _clear_tables():
+    """Delete all rows in a single transaction and drop cached lookups."""
+    with get_engine().begin() as conn:
+        for table in _CLEARED_TABLES:
+            conn.exec_driver_sql(f"DELETE FROM {table}")
+    tenants_cache.invalidate()
+    external_agents_cache.invalidate()
+    preflight_cache.invalidate()
+
+
 @pytest.fixture(autouse=True)
 def clean_db(request):
-    """Clean the database before and after each test."""
+    """Start each test with empty tables and caches.
+
+    Cleaning only on setup is enough: whatever a test leaves behind is cleared
+    before the next one runs, and the database file is removed at session end.
+    """
     # Skip cleaning for tests marked with no_clean_db
     if hasattr(request.node, "get_closest_marker") and request.node.get_closest_marker(
         "no_clean_db"
@@ -58,26 +78,9 @@ def clean_db(request):
         yield
         return
 
-    engine = get_engine()
-
-    # Clear all data from tables before test
-    with engine.connect() as conn:
-        conn.execute(text("DELETE FROM product"))
-        conn.execute(text("DELETE FROM externalagent"))
-        conn.execute(text("DELETE FROM agentsettings"))
-        conn.execute(text("DELETE FROM tenant"))
-        conn.commit()
-
+    _clear_tables()
     yield
 
-    # Clear all data from tables after test
-    with engine.connect() as conn:
-        conn.execute(text("DELETE FROM product"))
-        conn.execute(text("DELETE FROM externalagent"))
-        conn.execute(text("DELETE FROM agentsettings"))
-        conn.execute(text("DELETE FROM tenant"))
-        conn.commit()
-
 
 @pytest.fixture
 def db_session():
@@ -97,3 +100,28 @@ def client():
     from app.main import app
 
     return TestClient(app)
+
+
+@pytest.fixture
+def count_queries():
+    """Collect SQL statements run on the app engine inside a with-block.
+
+    Usage: ``with count_queries() as statements: ...`` then assert on
+    ``len(statements)`` to pin a route's query budget.
+    """
+
+    @contextmanager
+    def counter():
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        engine = get_engine()
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+    return counter
@@ -1,7 +1,8 @@
 """Tests for AI provider error handling."""
 
+from unittest.mock import AsyncMock, MagicMock, patch
+
 import pytest
-from unittest.mock import patch, MagicMock
 
 from app.ai.errors import AIConfigError, AIRequestError, AITimeoutError
 from app.ai.gemini import GeminiProvider
@@ -169,3 +170,220 @@ def test_gemini_provider_api_error():
             )
 
         assert "AI request failed" in str(exc_info.value)
+
+
+async def test_gemini_provider_uses_async_client_with_timeout():
+    """Test Gemini provider awaits the async SDK call and passes the timeout."""
+    with patch("app.config.settings.gemini_api_key", "fake-api-key"):
+        provider = GeminiProvider()
+
+    response = MagicMock()
+    response.text = '[{"product_id": "test", "reason": "Matches brief"}]'
+    provider.model = MagicMock()
+    provider.model.generate_content_async = AsyncMock(return_value=response)
+
+    result = await provider.rank_products(
+        brief="Test brief",
+        prompt="Test prompt",
+        products=[{"product_id": "test", "name": "Test"}],
+        model_name="gemini-1.5-pro",
+        timeout_ms=5000,
+    )
+
+    assert result[0]["product_id"] == "test"
+    provider.model.generate_content.assert_not_called()
+    _, kwargs = provider.model.generate_content_async.call_args
+    assert kwargs["request_options"] == {"timeout": 5.0}
+
+
+async def test_gemini_provider_deadline_exceeded_maps_to_timeout():
+    """Test Gemini provider maps SDK deadline errors to AITimeoutError."""
+    from google.api_core.exceptions import DeadlineExceeded
+
+    with patch("app.config.settings.gemini_api_key", "fake-api-key"):
+        provider = GeminiProvider()
+
+    provider.model = MagicMock()
+    provider.model.generate_content_async = AsyncMock(
+        side_effect=DeadlineExceeded("Deadline Exceeded")
+    )
+
+    with pytest.raises(AITimeoutError) as exc_info:
+        await provider.rank_products(
+            brief="Test brief",
+            prompt="Test prompt",
+            products=[{"product_id": "test", "name": "Test"}],
+            model_name="gemini-1.5-pro",
+            timeout_ms=5000,
+        )
+
+    assert "timed out after 5000ms" in str(exc_info.value)
+
+
+async def test_gemini_provider_strips_markdown_fences():
+    """Test Gemini provider parses JSON wrapped in markdown code fences."""
+    with patch("app.config.settings.gemini_api_key", "fake-api-key"):
+        provider = GeminiProvider()
+
+    response = MagicMock()
+    response.text = '```json\n[{"product_id": "test", "reason": "Fenced"}]\n```'
+    provider.model = MagicMock()
+    provider.model.generate_content_async = AsyncMock(return_value=response)
+
+    result = await provider.rank_products(
+        brief="Test brief",
+        prompt="Test prompt",
+        products=[{"product_id": "test", "name": "Test"}],
+        model_name="gemini-1.5-pro",
+        timeout_ms=5000,
+    )
+
+    assert result == [{"product_id": "test", "reason": "Fenced"}]
+
+
+async def test_gemini_provider_shards_products_and_merges_by_score():
+    """Test Gemini provider ranks shards concurrently and merges by score."""
+    with patch("app.config.settings.gemini_api_key", "fake-api-key"):
+        provider = GeminiProvider()
+
+    shard_responses = [
+        '[{"product_id": "a", "reason": "ok", "score": 0.4}]',
+        '[{"product_id": "b", "reason": "best", "score": 0.9}]',
+        '[{"product_id": "c", "reason": "unscored", "score": null}]',
+    ]
+    responses = []
+    for text in shard_responses:
+        response = MagicMock()
+        response.text = text
+        responses.append(response)
+
+    provider.model = MagicMock()
+    provider.model.generate_content_async = AsyncMock(side_effect=responses)
+
+    result = await provider.rank_products(
+        brief="Test brief",
+        prompt="Test prompt",
+        products=[{"product_id": f"p{i}"} for i in range(5)],
+        model_name="gemini-1.5-pro",
+        timeout_ms=5000,
+        shard_size=2,
+    )
+
+    assert provider.model.generate_content_async.await_count == 3
+    assert [item["product_id"] for item in result] == ["b", "a", "c"]
+
+
+def test_default_provider_is_cached_singleton():
+    """Test get_default_provider builds the Gemini provider once."""
+    from app.ai.provider import get_default_provider
+
+    get_default_provider.cache_clear()
+    try:
+        with patch("app.config.settings.gemini_api_key", "fake-api-key"):
+            first = get_default_provider()
+            assert get_default_provider() is first
+            assert isinstance(first, GeminiProvider)
+    finally:
+        get_default_provider.cache_clear()
+
+
+def test_default_provider_missing_key_raises_config_error():
+    """Test get_default_provider surfaces AIConfigError without caching it."""
+    from app.ai.provider import get_default_provider
+
+    get_default_provider.cache_clear()
+    with patch("app.config.settings.gemini_api_key", None):
+        with pytest.raises(AIConfigError):
+            get_default_provider()
+    assert get_default_provider.cache_info().currsize == 0
+
+
+async def test_gemini_provider_failed_shard_cancels_siblings():
+    """Test a failing shard cancels the shards still in flight."""
+    import asyncio
+
+    with patch("app.config.settings.gemini_api_key", "fake-api-key"):
+        provider = GeminiProvider()
+
+    cancelled = asyncio.Event()
+
+    async def generate(prompt, request_options):
+        if '"p0"' in prompt:
+            raise Exception("API Error")
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    provider.model = MagicMock()
+    provider.model.generate_content_async = generate
+
+    with pytest.raises(AIRequestError):
+        await provider.rank_products(
+            brief="Test brief",
+            prompt="Test prompt",
+            products=[{"product_id": "p0"}, {"product_id": "p1"}],
+            model_name="gemini-1.5-pro",
+            timeout_ms=5000,
+            shard_size=1,
+        )
+
+    await asyncio.wait_for(cancelled.wait(), timeout=1)
+
+
+async def test_gemini_provider_deadline_covers_all_shard_waves():
+    """Test timeout_ms bounds the whole ranking when shards run in waves."""
+    import asyncio
+
+    with patch("app.config.settings.gemini_api_key", "fake-api-key"):
+        provider = GeminiProvider()
+
+    async def generate(prompt, request_options):
+        await asyncio.sleep(0.1)
+        response = MagicMock()
+        response.text = "[]"
+        return response
+
+    provider.model = MagicMock()
+    provider.model.generate_content_async = generate
+
+    with patch("app.config.settings.ai_concurrency", 1):
+        with pytest.raises(AITimeoutError) as exc_info:
+            await provider.rank_products(
+                brief="Test brief",
+                prompt="Test prompt",
+                products=[{"product_id": f"p{i}"} for i in range(3)],
+                model_name="gemini-1.5-pro",
+                timeout_ms=150,
+                shard_size=1,
+            )
+
+    assert "timed out after 150ms" in str(exc_info.value)
+
+
+async def test_gemini_provider_caches_repeat_rankings():
+    """Test repeat briefs over unchanged products skip the Gemini call."""
+    with patch("app.config.settings.gemini_api_key", "fake-api-key"):
+        provider = GeminiProvider()
+
+    response = MagicMock()
+    response.text = '[{"product_id": "test", "reason": "Matches brief"}]'
+    provider.model = MagicMock()
+    provider.model.generate_content_async = AsyncMock(return_value=response)
+
+    kwargs = dict(
+        brief="Test brief",
+        prompt="Test prompt",
+        products=[{"product_id": "test", "name": "Test"}],
+        model_name="gemini-1.5-pro",
+        timeout_ms=5000,
+    )
+    first = await provider.rank_products(**kwargs)
+    second = await provider.rank_products(**kwargs)
+    assert first == second
+    assert provider.model.generate_content_async.await_count == 1
+
+    kwargs["products"] = [{"product_id": "test", "name": "Renamed"}]
+    await provider.rank_products(**kwargs)
+    assert provider.model.generate_content_async.await_count == 2
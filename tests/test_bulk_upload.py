@@ -217,3 +217,28 @@ def test_csv_upload_wrong_file_type_returns_error(client):
     # Should show error message
     content = response.text
     assert "Please upload a CSV file" in content
+
+
+def test_csv_columns_in_any_order_and_bad_optional_cpm(client):
+    """Test columns are matched by header name and a bad optional cpm is reported."""
+    # Create tenant and select it
+    client.post(
+        "/tenants/add",
+        data={"name": "Test Publisher", "slug": "test-publisher-reordered"},
+        follow_redirects=False,
+    )
+
+    client.post("/tenants/select", data={"tenant_id": 1}, follow_redirects=False)
+
+    # Reordered columns; cpm is optional here but still has to be a number
+    csv_content = """name,product_id,cpm,description,delivery_type,is_fixed_price,is_custom,expires_at,policy_compliance,targeted_ages,verified_minimum_age
+Product 1,reordered-1,abc,Description 1,non_guaranteed,false,false,,,,"""
+
+    # Upload CSV
+    files = {"file": ("test.csv", BytesIO(csv_content.encode()), "text/csv")}
+    response = client.post("/tenant/1/products/bulk-upload", files=files)
+
+    # Should return a field error rather than a generic parse failure
+    assert response.status_code == 400
+    content = response.text
+    assert "Row 2: cpm - Must be a valid number" in content
@@ -0,0 +1,119 @@
+"""Tests for database engine caching and connection setup."""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from sqlalchemy import create_engine, text
+
+from app.db import _drop_duplicate_agent_settings, get_engine, get_session
+from app.models import AgentSettings
+
+
+def test_get_engine_returns_cached_instance():
+    """Test that repeated calls share one engine instead of rebuilding it."""
+    assert get_engine() is get_engine()
+
+
+def test_get_engine_builds_once_under_concurrent_first_use():
+    """Test that threads racing on first use share a single engine."""
+    built = []
+
+    def slow_build():
+        time.sleep(0.01)
+        built.append(object())
+        return built[-1]
+
+    with patch("app.db._engine", None), patch(
+        "app.db._build_engine", side_effect=slow_build
+    ):
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            engines = list(executor.map(lambda _: get_engine(), range(8)))
+
+    assert len(built) == 1
+    assert all(engine is built[0] for engine in engines)
+
+
+def test_sqlite_pragmas_applied_on_connect():
+    """Test that pooled connections come up with the configured PRAGMAs."""
+    with get_engine().connect() as conn:
+        assert conn.execute(text("PRAGMA foreign_keys")).scalar() == 1
+        assert conn.execute(text("PRAGMA temp_store")).scalar() == 2
+
+
+def test_get_session_binds_shared_engine():
+    """Test that sessions are bound to the shared engine."""
+    with get_session() as session:
+        assert session.get_bind() is get_engine()
+
+
+def test_product_search_uses_tenant_sort_index():
+    """Test that tenant-scoped sorted search is planned as an index scan."""
+    with get_engine().connect() as conn:
+        plan = conn.execute(
+            text(
+                "EXPLAIN QUERY PLAN SELECT * FROM product "
+                "WHERE tenant_id = 1 ORDER BY created_at, id LIMIT 20"
+            )
+        ).all()
+    details = " ".join(row[-1] for row in plan)
+    assert "ix_product_tenant_created" in details
+    assert "TEMP B-TREE" not in details
+
+
+def test_product_cpm_keyset_page_uses_tenant_cpm_index():
+    """Test that cpm-sorted keyset pages read ix_product_tenant_cpm in order."""
+    with get_engine().connect() as conn:
+        plan = conn.execute(
+            text(
+                "EXPLAIN QUERY PLAN SELECT * FROM product "
+                "WHERE tenant_id = 1 AND ((cpm, id) < (5.0, 3) OR cpm IS NULL) "
+                "ORDER BY cpm DESC, id DESC LIMIT 20"
+            )
+        ).all()
+    details = " ".join(row[-1] for row in plan)
+    assert "ix_product_tenant_cpm" in details
+    assert "TEMP B-TREE" not in details
+
+
+def test_enabled_external_agents_use_partial_index():
+    """Test that the enabled-agents dropdown query reads the partial index."""
+    with get_engine().connect() as conn:
+        plan = conn.execute(
+            text(
+                "EXPLAIN QUERY PLAN SELECT * FROM externalagent "
+                "WHERE externalagent.enabled = 1 ORDER BY externalagent.name"
+            )
+        ).all()
+    details = " ".join(row[-1] for row in plan)
+    assert "ix_externalagent_enabled_name" in details
+
+
+def test_duplicate_agent_settings_dropped_before_unique_index(tmp_path):
+    """Test a legacy database with duplicate settings rows can gain the index."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.sqlite3'}")
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE TABLE agentsettings (id INTEGER PRIMARY KEY, "
+                "tenant_id INTEGER, prompt_override TEXT, model_name TEXT, "
+                "timeout_ms INTEGER)"
+            )
+        )
+        conn.execute(
+            text(
+                "INSERT INTO agentsettings (id, tenant_id, timeout_ms) "
+                "VALUES (1, 1, 1000), (2, 1, 2000), (3, 2, 3000)"
+            )
+        )
+
+    _drop_duplicate_agent_settings(engine)
+    for index in AgentSettings.__table__.indexes:
+        index.create(engine, checkfirst=True)
+
+    with engine.connect() as conn:
+        rows = conn.execute(
+            text("SELECT id, tenant_id FROM agentsettings ORDER BY id")
+        ).all()
+    assert [tuple(row) for row in rows] == [(2, 1), (3, 2)]
+    engine.dispose()
@@ -23,3 +23,17 @@ async def test_health_endpoint():
     assert data["status"] == "ok"
     assert data["service"] == "adcp-demo-orchestrator"
     assert data["version"] == "0.1.0"
+
+
+def test_health_endpoint_skips_tenant_context_load():
+    """Test that health checks never load tenant context from the database."""
+    from unittest.mock import patch
+
+    from fastapi.testclient import TestClient
+
+    client = TestClient(app)
+    with patch("app.services.navbar_context.get_session") as mock_session:
+        response = client.get("/health")
+
+    assert response.status_code == 200
+    mock_session.assert_not_called()
@@ -0,0 +1,33 @@
+"""Tests for the shared outbound HTTP client lifecycle."""
+
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.main import app
+from app.services.orchestrator import get_agent_client
+
+
+def test_http_client_created_on_startup_and_closed_on_shutdown():
+    """Test that one pooled client lives for the app's lifetime."""
+    with TestClient(app):
+        http_client = app.state.http_client
+        assert not http_client.is_closed
+        assert str(http_client.base_url).rstrip("/") == (
+            settings.service_base_url.rstrip("/")
+        )
+
+    assert http_client.is_closed
+
+
+def test_agent_client_reused_across_calls_and_closed_on_shutdown():
+    """Test that agent calls on one event loop share a single pooled client."""
+    with TestClient(app) as client:
+        first = client.portal.call(_get_agent_client)
+        assert client.portal.call(_get_agent_client) is first
+        assert not first.is_closed
+
+    assert first.is_closed
+
+
+async def _get_agent_client():
+    return get_agent_client()
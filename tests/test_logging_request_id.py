@@ -1,8 +1,11 @@
 """Tests for logging and request ID functionality."""
 
+import json
+import logging
+from unittest.mock import patch
+
 import pytest
 from fastapi.testclient import TestClient
-from unittest.mock import patch
 
 from app.main import app
 
@@ -86,3 +89,30 @@ class TestLoggingAndRequestId:
 
         assert response.status_code == 200
         # Middleware should not interfere with normal operation
+
+
+class TestRequestIdContext:
+    """Test that log records take their request ID from the current context."""
+
+    def _format(self, message):
+        from app.utils.logging import JSONFormatter, RequestIdFilter
+
+        record = logging.LogRecord("test", logging.INFO, __file__, 1, message, (), None)
+        RequestIdFilter().filter(record)
+        return json.loads(JSONFormatter().format(record))
+
+    def test_record_uses_request_id_set_in_context(self):
+        """Test records carry the ID until the context is reset."""
+        from app.utils.logging import NO_REQUEST_ID, reset_request_id, set_request_id
+
+        token = set_request_id("abc123")
+        try:
+            assert self._format("inside")["request_id"] == "abc123"
+        finally:
+            reset_request_id(token)
+
+        assert self._format("outside")["request_id"] == NO_REQUEST_ID
+
+    def test_message_with_quotes_stays_valid_json(self):
+        """Test the formatter escapes messages instead of splicing them in."""
+        assert self._format('say "hi"')["msg"] == 'say "hi"'
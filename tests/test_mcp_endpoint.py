@@ -1,9 +1,19 @@
 """Tests for successful MCP endpoint calls."""
 
+from unittest.mock import MagicMock, patch
+
 import pytest
-from unittest.mock import patch, MagicMock
 
-from app.routes.mcp import get_mcp_info, rank_products
+from app.routes.mcp import get_git_commit_hash, get_mcp_info, rank_products
+
+
+@pytest.fixture(autouse=True)
+def clear_commit_hash_cache(monkeypatch):
+    """Resolve the commit hash afresh for each test's subprocess patch."""
+    monkeypatch.delenv("GIT_COMMIT", raising=False)
+    get_git_commit_hash.cache_clear()
+    yield
+    get_git_commit_hash.cache_clear()
 
 
 class TestMCPEndpoint:
@@ -36,6 +46,29 @@ class TestMCPEndpoint:
                 assert result["commit_hash"] == "unknown"
                 assert result["capabilities"] == ["ranking"]
 
+    @pytest.mark.asyncio
+    async def test_get_mcp_info_resolves_commit_once(self):
+        """Test GET /mcp/ shells out to git only on the first call."""
+        with patch("subprocess.run") as mock_subprocess:
+            mock_subprocess.return_value.returncode = 0
+            mock_subprocess.return_value.stdout = "abc123\n"
+
+            first = await get_mcp_info()
+            second = await get_mcp_info()
+
+        assert first["commit_hash"] == second["commit_hash"] == "abc123"
+        mock_subprocess.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_get_mcp_info_prefers_build_commit_env(self, monkeypatch):
+        """Test GET /mcp/ reports a build-time GIT_COMMIT without running git."""
+        monkeypatch.setenv("GIT_COMMIT", "deadbee")
+        with patch("subprocess.run") as mock_subprocess:
+            result = await get_mcp_info()
+
+        assert result["commit_hash"] == "deadbee"
+        mock_subprocess.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_rank_products_success(self):
         """Test POST /mcp/agents/{slug}/rank with valid request."""
@@ -220,3 +253,21 @@ class TestMCPEndpoint:
             assert result["items"][0]["product_id"] == "prod_3"
             assert result["items"][1]["product_id"] == "prod_1"
             assert result["items"][2]["product_id"] == "prod_2"
+
+
+def test_get_mcp_info_revalidates_with_etag(client, monkeypatch):
+    """Test GET /mcp/ sends an ETag and answers a matching If-None-Match with 304."""
+    monkeypatch.setenv("GIT_COMMIT", "deadbee")
+
+    first = client.get("/mcp/")
+    assert first.status_code == 200
+    assert first.json()["commit_hash"] == "deadbee"
+    etag = first.headers["etag"]
+
+    revalidated = client.get("/mcp/", headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert revalidated.headers["etag"] == etag
+
+    stale = client.get("/mcp/", headers={"If-None-Match": '"stale"'})
+    assert stale.status_code == 200
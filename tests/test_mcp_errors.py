@@ -1,11 +1,12 @@
 """Tests for MCP error handling and validation."""
 
+from unittest.mock import MagicMock, patch
+
 import pytest
-from unittest.mock import patch, MagicMock
 from fastapi.responses import JSONResponse
 
+from app.ai.errors import AIConfigError, AIRequestError, AITimeoutError
 from app.routes.mcp import rank_products
-from app.ai.errors import AIConfigError, AITimeoutError, AIRequestError
 
 
 class TestMCPErrors:
@@ -121,7 +122,7 @@ class TestMCPErrors:
         mock_tenant_repo.get_by_slug.return_value = mock_tenant
 
         # Mock no products
-        mock_product_repo.list_by_tenant.return_value = []
+        mock_product_repo.has_products.return_value = False
 
         # Create request
         from app.routes.mcp import AdCPRankingRequest
@@ -2,6 +2,8 @@
 
 from datetime import datetime
 
+from sqlmodel import select
+
 from app.models.agent_settings import AgentSettings
 from app.models.external_agent import ExternalAgent
 from app.models.product import Product
@@ -90,3 +92,76 @@ def test_product_creation_adcp_fields():
     formats = [{"format_id": "video_30s", "name": "30 Second Video", "type": "video"}]
     product.set_formats(formats)
     assert product.get_formats() == formats
+
+
+def test_json_field_helpers_tolerate_invalid_json():
+    """Test that JSON getters fall back to defaults on malformed values."""
+    product = Product(
+        tenant_id=1,
+        product_id="prod_bad_json",
+        name="Broken",
+        description="Malformed JSON fields",
+        delivery_type="guaranteed",
+        is_fixed_price=False,
+        formats="not json",
+        price_guidance="{broken",
+    )
+    agent = ExternalAgent(name="Agent", base_url="https://a.example.com", capabilities="{")
+
+    assert product.get_formats() == []
+    assert product.get_price_guidance() is None
+    assert agent.get_capabilities() == {}
+
+    agent.set_capabilities({"tools": ["rank"]})
+    assert agent.capabilities == '{"tools":["rank"]}'
+
+
+def test_product_json_getters_follow_the_column():
+    """Test that JSON getters always reflect the stored column."""
+    product = Product(
+        tenant_id=1,
+        product_id="prod_json",
+        name="JSON",
+        description="JSON fields",
+        delivery_type="guaranteed",
+        is_fixed_price=False,
+        formats='[{"format_id": "display_300x250"}]',
+    )
+
+    product.get_formats().append({"format_id": "mutated"})
+    assert product.get_formats() == [{"format_id": "display_300x250"}]
+
+    product.formats = '[{"format_id": "video_15s"}]'
+    assert product.get_formats() == [{"format_id": "video_15s"}]
+
+    product.set_price_guidance({"floor": 5.0})
+    assert product.get_price_guidance() == {"floor": 5.0}
+    product.set_price_guidance(None)
+    assert product.get_price_guidance() is None
+
+
+def test_product_json_getters_on_product_loaded_from_database(db_session):
+    """Test that JSON getters work on rows built by the ORM, not __init__."""
+    tenant = Tenant(name="Loaded Publisher", slug="loaded-publisher")
+    db_session.add(tenant)
+    db_session.commit()
+    db_session.add(
+        Product(
+            tenant_id=tenant.id,
+            product_id="prod_loaded",
+            name="Loaded",
+            description="Read back through a session",
+            delivery_type="guaranteed",
+            is_fixed_price=False,
+            formats='[{"format_id": "display_300x250"}]',
+        )
+    )
+    db_session.commit()
+    db_session.expunge_all()
+
+    product = db_session.exec(
+        select(Product).where(Product.product_id == "prod_loaded")
+    ).one()
+
+    assert product.get_formats() == [{"format_id": "display_300x250"}]
+    assert product.get_price_guidance() is None
@@ -1,7 +1,9 @@
 """Tests for orchestrator external agent functionality."""
 
+import asyncio
+from unittest.mock import MagicMock, patch
+
 import pytest
-from unittest.mock import patch, MagicMock
 
 from app.services.orchestrator import orchestrate
 
@@ -76,6 +78,28 @@ class TestOrchestratorExternal:
         assert agent_result["error"]["status"] == 408
         assert len(agent_result["items"]) == 0
 
+    @pytest.mark.asyncio
+    async def test_orchestrate_external_agent_overall_deadline(self):
+        """Test a call that never finishes is cut off at the timeout budget."""
+
+        async def hang(*args, **kwargs):
+            await asyncio.sleep(5)
+
+        with patch("httpx.AsyncClient.post", side_effect=hang):
+            result = await asyncio.wait_for(
+                orchestrate(
+                    brief="Test brief",
+                    internal_tenant_slugs=[],
+                    external_urls=["https://trickling-external-agent.com/adcp"],
+                    timeout_ms=50,
+                ),
+                timeout=2,
+            )
+
+        agent_result = result["results"][0]
+        assert agent_result["error"]["type"] == "timeout"
+        assert "timed out after 50ms" in agent_result["error"]["message"]
+
     @pytest.mark.asyncio
     async def test_orchestrate_external_agent_http_error(self):
         """Test external agent HTTP error handling."""
@@ -1,20 +1,24 @@
 """Tests for preflight checks."""
 
-import pytest
-from unittest.mock import patch, MagicMock, mock_open
+import asyncio
 from pathlib import Path
+from unittest.mock import MagicMock, mock_open, patch
+
+import pytest
 
+from app.routes.preflight import get_preflight_report
 from app.services.preflight import (
+    check_api_key,
     check_database_file,
     check_database_tables,
-    check_reference_repositories,
     check_default_prompt_file,
-    check_api_key,
+    check_reference_repositories,
     check_tenants,
-    run_checks,
     get_overall_status,
     get_status_summary,
+    run_checks,
 )
+from app.utils.cache import preflight_cache
 
 
 class TestPreflightChecks:
@@ -259,3 +263,38 @@ class TestPreflightChecks:
 
         result = get_status_summary(checks)
         assert result == {"ok": 2, "warn": 1, "fail": 1}
+
+
+class TestPreflightReportCache:
+    """Test the cached preflight report served to polling clients."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_run(self):
+        """Test that concurrent requests within the TTL run the checks once."""
+        preflight_cache.invalidate()
+        checks = {"api_key": {"status": "warn", "message": "test"}}
+        with patch("app.services.preflight.run_checks", return_value=checks) as run:
+            reports = await asyncio.gather(
+                *(get_preflight_report() for _ in range(5))
+            )
+            await get_preflight_report()
+
+        assert run.call_count == 1
+        assert all(report is reports[0] for report in reports)
+        assert reports[0]["overall_status"] == "warn"
+        assert reports[0]["summary"] == {"ok": 0, "warn": 1, "fail": 0}
+        preflight_cache.invalidate()
+
+    def test_preflight_json_revalidates_with_etag(self, client):
+        """Test GET /preflight answers a matching If-None-Match with 304."""
+        checks = {"api_key": {"status": "ok", "message": "test"}}
+        with patch("app.services.preflight.run_checks", return_value=checks):
+            first = client.get("/preflight")
+            revalidated = client.get(
+                "/preflight", headers={"If-None-Match": first.headers["etag"]}
+            )
+
+        assert first.status_code == 200
+        assert first.json()["overall_status"] == "ok"
+        assert revalidated.status_code == 304
+        assert revalidated.headers["etag"] == first.headers["etag"]
@@ -236,3 +236,34 @@ def test_tenant_access_validation(client):
     content = response.text
     assert "Tenant mismatch" in content
     assert "Please select tenant" in content
+
+
+def test_delete_product_of_other_tenant_returns_404(client):
+    """Test deleting another tenant's product is rejected and leaves it in place."""
+    for slug in ("test-publisher-owner", "test-publisher-other"):
+        client.post(
+            "/tenants/add",
+            data={"name": slug, "slug": slug},
+            follow_redirects=False,
+        )
+
+    client.post("/tenants/select", data={"tenant_id": 1}, follow_redirects=False)
+    client.post(
+        "/tenant/1/products/add",
+        data={
+            "product_id": "test-product-owned",
+            "name": "Owned Product",
+            "description": "Belongs to tenant 1",
+            "delivery_type": "guaranteed",
+            "is_fixed_price": "true",
+            "cpm": "15.00",
+        },
+        follow_redirects=False,
+    )
+
+    client.post("/tenants/select", data={"tenant_id": 2}, follow_redirects=False)
+    response = client.post("/tenant/2/products/1/delete", follow_redirects=False)
+    assert response.status_code == 404
+
+    client.post("/tenants/select", data={"tenant_id": 1}, follow_redirects=False)
+    assert "Owned Product" in client.get("/tenant/1/products").text
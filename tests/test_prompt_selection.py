@@ -1,13 +1,26 @@
 """Tests for prompt selection logic."""
 
+from unittest.mock import MagicMock, patch
+
 import pytest
-from unittest.mock import patch, MagicMock
 
-from app.services.sales_agent import evaluate_brief, load_default_prompt
+from app.ai.errors import AIConfigError
 from app.models.agent_settings import AgentSettings
 from app.models.product import Product
 from app.models.tenant import Tenant
-from app.ai.errors import AIConfigError
+from app.services.sales_agent import (
+    _read_prompt,
+    evaluate_brief,
+    load_default_prompt,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_prompt_cache():
+    """Keep mocked prompt reads out of the process-wide prompt cache."""
+    _read_prompt.cache_clear()
+    yield
+    _read_prompt.cache_clear()
 
 
 @pytest.fixture
@@ -65,6 +78,26 @@ def test_load_default_prompt_file_not_found():
         assert "Default prompt file not found" in str(exc_info.value)
 
 
+def test_load_default_prompt_reads_file_once_per_mtime():
+    """Test the prompt file is re-read only when its mtime changes."""
+    with patch("builtins.open", create=True) as mock_open, patch(
+        "os.stat"
+    ) as mock_stat:
+        mock_open.return_value.__enter__.return_value.read.side_effect = [
+            "First prompt",
+            "Edited prompt",
+        ]
+        mock_stat.return_value.st_mtime_ns = 1
+
+        assert load_default_prompt() == "First prompt"
+        assert load_default_prompt() == "First prompt"
+        assert mock_open.call_count == 1
+
+        mock_stat.return_value.st_mtime_ns = 2
+        assert load_default_prompt() == "Edited prompt"
+        assert mock_open.call_count == 2
+
+
 def test_evaluate_brief_uses_custom_prompt(mock_repos, sample_products):
     """Test that custom prompt override is used when available."""
     agent_settings_repo, product_repo, tenant_repo = mock_repos
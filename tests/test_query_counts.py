@@ -0,0 +1,99 @@
+"""Query budgets for hot routes, guarding against redundant SELECTs."""
+
+from io import BytesIO
+
+
+def _select_tenant(client):
+    client.post(
+        "/tenants/add",
+        data={"name": "Test Publisher", "slug": "test-publisher-queries"},
+        follow_redirects=False,
+    )
+    client.post("/tenants/select", data={"tenant_id": 1}, follow_redirects=False)
+
+
+def test_agent_settings_page_query_budget(client, count_queries):
+    """Test the agent page loads the tenant and its settings exactly once."""
+    _select_tenant(client)
+
+    with count_queries() as statements:
+        response = client.get("/tenant/1/agent")
+
+    assert response.status_code == 200
+    assert len(statements) <= 2, statements
+
+
+def test_agent_settings_invalid_post_query_budget(client, count_queries):
+    """Test a rejected settings update does not re-load the tenant."""
+    _select_tenant(client)
+
+    with count_queries() as statements:
+        response = client.post(
+            "/tenant/1/agent",
+            data={"model_name": "gemini-1.5-pro", "timeout_ms": "10"},
+        )
+
+    assert response.status_code == 400
+    assert len(statements) <= 2, statements
+
+
+def test_buyer_page_query_budget(client, count_queries):
+    """Test the buyer page queries its pickers once, then serves them cached."""
+    with count_queries() as statements:
+        assert client.get("/buyer").status_code == 200
+    assert len(statements) <= 2, statements
+
+    with count_queries() as statements:
+        assert client.get("/buyer").status_code == 200
+        response = client.post("/buyer", data={"brief": " "})
+    assert response.status_code == 200
+    assert statements == []
+
+
+def test_csv_upload_inserts_each_chunk_once(client, count_queries):
+    """Test a CSV upload sends its rows as one INSERT, not one per product."""
+    _select_tenant(client)
+    rows = "\n".join(
+        f"csv-{i},Product {i},Description {i},guaranteed,false,,false,,,,"
+        for i in range(3)
+    )
+    csv_content = (
+        "product_id,name,description,delivery_type,is_fixed_price,cpm,is_custom,"
+        "expires_at,policy_compliance,targeted_ages,verified_minimum_age\n" + rows
+    )
+
+    with count_queries() as statements:
+        response = client.post(
+            "/tenant/1/products/bulk-upload",
+            files={"file": ("test.csv", BytesIO(csv_content.encode()), "text/csv")},
+            follow_redirects=False,
+        )
+
+    assert response.status_code == 302
+    inserts = [s for s in statements if s.lstrip().upper().startswith("INSERT")]
+    assert len(inserts) == 1, inserts
+
+
+def test_product_list_last_page_skips_count(client, count_queries):
+    """Test a list that fits on one page derives its total without a COUNT."""
+    _select_tenant(client)
+    client.post(
+        "/tenant/1/products/add",
+        data={
+            "product_id": "count-free",
+            "name": "Count Free",
+            "description": "Single page product",
+            "delivery_type": "guaranteed",
+            "is_fixed_price": "true",
+            "cpm": "10.00",
+        },
+        follow_redirects=False,
+    )
+
+    with count_queries() as statements:
+        response = client.get("/tenant/1/products")
+
+    assert response.status_code == 200
+    assert "Showing 1 to 1 of 1 products" in response.text
+    counts = [s for s in statements if "count(" in s.lower()]
+    assert counts == [], counts
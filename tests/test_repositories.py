@@ -1,15 +1,22 @@
 """Tests for repository layer."""
 
 import pytest
-from sqlmodel import Session, create_engine
+from sqlmodel import Session, create_engine, select
 
+from app.models.agent_settings import AgentSettings
 from app.models.external_agent import ExternalAgent
 from app.models.product import Product
 from app.models.tenant import Tenant
 from app.repositories.agent_settings import AgentSettingsRepository
 from app.repositories.external_agents import ExternalAgentRepository
-from app.repositories.products import ProductRepository
-from app.repositories.tenants import TenantRepository
+from app.repositories.products import (
+    DuplicateProductError,
+    ProductRepository,
+    cursor_after,
+)
+from app.repositories.tenants import DuplicateSlugError, TenantRepository
+from app.services.csv_import import CSVRowErrors, iter_product_chunks
+from app.utils.fts import ensure_product_fts
 
 
 @pytest.fixture
@@ -85,7 +92,7 @@ def test_products_repository_bulk_create(session):
     assert all(p.id is not None for p in created)
 
     # List by tenant
-    tenant_products = product_repo.list_by_tenant(tenant.id)
+    tenant_products = list(product_repo.list_by_tenant(tenant.id))
     assert len(tenant_products) == 2
     assert {p.product_id for p in tenant_products} == {"prod_1", "prod_2"}
 
@@ -155,3 +162,424 @@ def test_external_agents_repository_enabled_filter(session):
     assert len(enabled_agents) == 1
     assert enabled_agents[0].id == enabled_agent.id
     assert enabled_agents[0].name == "Enabled Agent"
+
+
+def test_tenants_repository_list_minimal(session):
+    """Test Tenants repo: list_minimal returns ordered id/name/slug rows."""
+    repo = TenantRepository(session)
+    beta = repo.create(Tenant(name="Beta", slug="beta"))
+    alpha = repo.create(Tenant(name="Alpha", slug="alpha"))
+
+    rows = repo.list_minimal()
+
+    assert [(row.id, row.name, row.slug) for row in rows] == [
+        (alpha.id, "Alpha", "alpha"),
+        (beta.id, "Beta", "beta"),
+    ]
+
+
+def test_tenants_repository_list_summary(session):
+    """Test Tenants repo: list_summary returns ordered rows with timestamps."""
+    repo = TenantRepository(session)
+    beta = repo.create(Tenant(name="Beta", slug="beta"))
+    alpha = repo.create(Tenant(name="Alpha", slug="alpha"))
+
+    rows = repo.list_summary()
+
+    assert [(row.id, row.slug) for row in rows] == [
+        (alpha.id, "alpha"),
+        (beta.id, "beta"),
+    ]
+    assert rows[0].created_at == alpha.created_at
+    assert not isinstance(rows[0], Tenant)
+
+
+def test_products_repository_keyset_pagination(session):
+    """Test Products repo: cursor pages walk every row once, ties broken by id."""
+    tenant = TenantRepository(session).create(
+        Tenant(name="Test Publisher", slug="test-publisher")
+    )
+    repo = ProductRepository(session)
+    repo.bulk_create(
+        [
+            Product(
+                tenant_id=tenant.id,
+                product_id=f"keyset_{i}",
+                name=name,
+                description="Keyset paging",
+                delivery_type="guaranteed",
+                is_fixed_price=False,
+                cpm=cpm,
+            )
+            for i, (name, cpm) in enumerate(
+                [("B", 5.0), ("A", None), ("B", 2.0), ("C", 9.0), ("A", 1.0)]
+            )
+        ]
+    )
+
+    def walk(sort: str, order: str) -> list:
+        seen, cursor = [], None
+        while True:
+            page, cursor = repo.search_by_tenant_after(
+                tenant.id, sort=sort, order=order, size=2, cursor=cursor
+            )
+            seen.extend(p.product_id for p in page)
+            if cursor is None:
+                return seen
+
+    assert walk("name", "asc") == [
+        "keyset_1",
+        "keyset_4",
+        "keyset_0",
+        "keyset_2",
+        "keyset_3",
+    ]
+    assert walk("name", "desc") == [
+        "keyset_3",
+        "keyset_2",
+        "keyset_0",
+        "keyset_4",
+        "keyset_1",
+    ]
+    assert walk("cpm", "asc") == [
+        "keyset_1",
+        "keyset_4",
+        "keyset_2",
+        "keyset_0",
+        "keyset_3",
+    ]
+    assert walk("cpm", "desc") == [
+        "keyset_3",
+        "keyset_0",
+        "keyset_2",
+        "keyset_4",
+        "keyset_1",
+    ]
+    assert sorted(walk("created_at", "desc")) == sorted(
+        f"keyset_{i}" for i in range(5)
+    )
+
+    with pytest.raises(ValueError):
+        repo.search_by_tenant_after(tenant.id, cursor="not-a-cursor")
+
+
+def test_products_repository_offset_page_continues_by_cursor(session):
+    """Test Products repo: a cursor from an offset page resumes right after it."""
+    tenant = TenantRepository(session).create(
+        Tenant(name="Test Publisher", slug="test-publisher")
+    )
+    repo = ProductRepository(session)
+    repo.bulk_create(
+        [
+            Product(
+                tenant_id=tenant.id,
+                product_id=f"mixed_{i}",
+                name=f"Product {i % 2}",
+                description="Mixed paging",
+                delivery_type="guaranteed",
+                is_fixed_price=False,
+                cpm=None if i % 3 == 0 else float(i % 3),
+            )
+            for i in range(7)
+        ]
+    )
+
+    for sort in ("name", "cpm"):
+        everything, total = repo.search_by_tenant(tenant.id, sort=sort, size=100)
+        first, _ = repo.search_by_tenant(tenant.id, sort=sort, page=1, size=3)
+        rest, next_cursor = repo.search_by_tenant_after(
+            tenant.id, sort=sort, size=100, cursor=cursor_after(first[-1], sort)
+        )
+
+        assert total == repo.count_search(tenant.id) == 7
+        assert [p.id for p in first + rest] == [p.id for p in everything]
+        assert next_cursor is None
+
+
+def test_products_repository_full_text_search(session):
+    """Test Products repo: FTS search keeps substring, case-insensitive matching."""
+    assert ensure_product_fts(session.get_bind())
+    tenant = TenantRepository(session).create(
+        Tenant(name="Test Publisher", slug="test-publisher")
+    )
+    repo = ProductRepository(session)
+    repo.bulk_create(
+        [
+            Product(
+                tenant_id=tenant.id,
+                product_id=product_id,
+                name=name,
+                description=description,
+                delivery_type="guaranteed",
+                is_fixed_price=False,
+            )
+            for product_id, name, description in [
+                ("fts_video", "Video Streaming Ad", "Streaming advertising"),
+                ("fts_mobile", "Mobile Banner", 'Banner "rich" advertising'),
+            ]
+        ]
+    )
+
+    def search(query: str) -> list:
+        products, total = repo.search_by_tenant(tenant.id, query=query)
+        assert total == len(products)
+        return [p.product_id for p in products]
+
+    assert search("VIDEO") == ["fts_video"]
+    assert search("vertis") == ["fts_mobile", "fts_video"]
+    assert search('"rich"') == ["fts_mobile"]
+    # Too short for trigrams, served by the LIKE fallback
+    assert search("Ba") == ["fts_mobile"]
+
+    product = repo.get_by_product_id("fts_video")
+    product.name = "Outstream Ad"
+    repo.update(product)
+    assert search("outstream") == ["fts_video"]
+
+
+def test_products_repository_bulk_delete(session):
+    """Test Products repo: set-based deletes report rowcounts, scoped to tenant."""
+    tenant_repo = TenantRepository(session)
+    keep = tenant_repo.create(Tenant(name="Keep", slug="keep"))
+    purge = tenant_repo.create(Tenant(name="Purge", slug="purge"))
+    repo = ProductRepository(session)
+    repo.bulk_create(
+        [
+            Product(
+                tenant_id=tenant.id,
+                product_id=f"{tenant.slug}_{i}",
+                name=f"Product {i}",
+                description="Bulk delete",
+                delivery_type="guaranteed",
+                is_fixed_price=False,
+            )
+            for tenant in (keep, purge)
+            for i in range(3)
+        ]
+    )
+
+    assert repo.count_by_tenant(purge.id) == 3
+    assert repo.delete_all_by_tenant(purge.id) == 3
+    assert repo.delete_all_by_tenant(purge.id) == 0
+    assert repo.count_by_tenant(purge.id) == 0
+    assert repo.count_by_tenant(keep.id) == 3
+    assert repo.has_products(purge.id) is False
+    assert repo.has_products(keep.id) is True
+
+    # Read the id up front: the deleted instance is expired after commit
+    pid = repo.get_by_product_id("keep_0").id
+    assert repo.delete(pid) is True
+    assert repo.delete(pid) is False
+    assert repo.get_by_product_id("keep_0") is None
+
+
+def test_products_repository_bulk_create_assigns_matching_ids(session):
+    """Test Products repo: batched insert hands each product its own row id."""
+    tenant = TenantRepository(session).create(
+        Tenant(name="Test Publisher", slug="test-publisher")
+    )
+    repo = ProductRepository(session)
+    created = repo.bulk_create(
+        [
+            Product(
+                tenant_id=tenant.id,
+                product_id=f"batch_{i}",
+                name=f"Product {i}",
+                description="Batched insert",
+                delivery_type="guaranteed",
+                is_fixed_price=False,
+            )
+            for i in range(5)
+        ]
+    )
+
+    for product in created:
+        assert repo.get_by_id(product.id).product_id == product.product_id
+    assert repo.bulk_create([]) == []
+
+
+def test_products_repository_list_by_tenant_streams(session, monkeypatch):
+    """Test Products repo: list_by_tenant streams every row in batches."""
+    monkeypatch.setattr("app.repositories.products._STREAM_BATCH_SIZE", 2)
+    tenant = TenantRepository(session).create(
+        Tenant(name="Test Publisher", slug="test-publisher")
+    )
+    repo = ProductRepository(session)
+    repo.bulk_create(
+        [
+            Product(
+                tenant_id=tenant.id,
+                product_id=f"stream_{i}",
+                name=f"Product {i}",
+                description="Streamed",
+                delivery_type="guaranteed",
+                is_fixed_price=False,
+            )
+            for i in reversed(range(5))
+        ]
+    )
+
+    streamed = repo.list_by_tenant(tenant.id)
+
+    assert not isinstance(streamed, list)
+    assert [p.product_id for p in streamed] == [f"stream_{i}" for i in range(5)]
+
+
+def test_cached_lookup_statements_bind_each_call(session):
+    """Test lambda-cached lookups use each call's arguments, not the first."""
+    tenant_repo = TenantRepository(session)
+    alpha = tenant_repo.create(Tenant(name="Alpha", slug="alpha"))
+    beta = tenant_repo.create(Tenant(name="Beta", slug="beta"))
+
+    assert tenant_repo.get_by_id(alpha.id).slug == "alpha"
+    assert tenant_repo.get_by_id(beta.id).slug == "beta"
+    assert tenant_repo.get_by_slug("beta").id == beta.id
+    assert tenant_repo.get_by_slug("missing") is None
+    assert [t.slug for t in tenant_repo.list_all()] == ["alpha", "beta"]
+
+
+def test_products_repository_unknown_sort_falls_back_to_name(session):
+    """Test Products repo: an unrecognized sort key orders by name."""
+    tenant = TenantRepository(session).create(
+        Tenant(name="Test Publisher", slug="test-publisher")
+    )
+    repo = ProductRepository(session)
+    repo.bulk_create(
+        [
+            Product(
+                tenant_id=tenant.id,
+                product_id=f"sort_{name}",
+                name=name,
+                description="Sort fallback",
+                delivery_type="guaranteed",
+                is_fixed_price=False,
+            )
+            for name in ("Charlie", "Alpha", "Bravo")
+        ]
+    )
+
+    products, _ = repo.search_by_tenant(tenant.id, sort="bogus", order="desc")
+
+    assert [p.name for p in products] == ["Charlie", "Bravo", "Alpha"]
+
+
+def test_agent_settings_upsert_keeps_one_row_per_tenant(session):
+    """Test AgentSettings repo: repeated upserts update the same row in place."""
+    tenant = TenantRepository(session).create(
+        Tenant(name="Test Publisher", slug="test-publisher")
+    )
+    settings_repo = AgentSettingsRepository(session)
+
+    created = settings_repo.upsert_for_tenant(tenant.id, not_a_column="ignored")
+    assert created.model_name == "gemini-1.5-pro"
+    assert created.timeout_ms == 30000
+
+    updated = settings_repo.upsert_for_tenant(tenant.id, model_name="claude-3-haiku")
+    assert updated.id == created.id
+    assert updated.model_name == "claude-3-haiku"
+
+    unchanged = settings_repo.upsert_for_tenant(tenant.id)
+    assert unchanged.id == created.id
+    assert unchanged.model_name == "claude-3-haiku"
+
+    rows = session.exec(
+        select(AgentSettings).where(AgentSettings.tenant_id == tenant.id)
+    ).all()
+    assert len(rows) == 1
+
+
+CSV_HEADER = (
+    "product_id,name,description,delivery_type,is_fixed_price,cpm,is_custom,"
+    "expires_at,policy_compliance,targeted_ages,verified_minimum_age\n"
+)
+
+
+def test_products_repository_bulk_import_streams_chunks(session):
+    """Test Products repo: bulk_import inserts every chunk of a streamed CSV."""
+    tenant = TenantRepository(session).create(
+        Tenant(name="Test Publisher", slug="test-publisher")
+    )
+    lines = [CSV_HEADER] + [
+        f"csv_{i},Product {i},Streamed,guaranteed,false,,false,,,,\n" for i in range(5)
+    ]
+    chunks = list(iter_product_chunks(iter(lines), tenant.id, chunk_size=2))
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+
+    repo = ProductRepository(session)
+    assert repo.bulk_import(chunks) == 5
+    assert len(list(repo.list_by_tenant(tenant.id))) == 5
+
+
+def test_products_repository_bulk_import_rolls_back_on_row_error(session):
+    """Test Products repo: a bad row late in the CSV discards earlier chunks."""
+    tenant = TenantRepository(session).create(
+        Tenant(name="Test Publisher", slug="test-publisher")
+    )
+    lines = [CSV_HEADER] + [
+        f"csv_{i},Product {i},Streamed,guaranteed,false,,false,,,,\n" for i in range(4)
+    ]
+    lines.append("csv_bad,Bad,Streamed,invalid_type,false,,false,,,,\n")
+
+    repo = ProductRepository(session)
+    with pytest.raises(CSVRowErrors) as exc_info:
+        repo.bulk_import(iter_product_chunks(iter(lines), tenant.id, chunk_size=2))
+
+    assert [error.row_number for error in exc_info.value.errors] == [6]
+    assert list(repo.list_by_tenant(tenant.id)) == []
+
+
+def test_products_repository_create_rejects_duplicate_product_id(session):
+    """Test Products repo: create raises DuplicateProductError on a taken id."""
+    tenant = TenantRepository(session).create(
+        Tenant(name="Test Publisher", slug="test-publisher")
+    )
+    repo = ProductRepository(session)
+
+    def make():
+        return Product(
+            tenant_id=tenant.id,
+            product_id="dup_1",
+            name="Product",
+            description="Duplicate check",
+            delivery_type="guaranteed",
+            is_fixed_price=False,
+        )
+
+    created = repo.create(make())
+    assert repo.get_by_id(created.id).product_id == "dup_1"
+
+    with pytest.raises(DuplicateProductError):
+        repo.create(make())
+    assert repo.count_by_tenant(tenant.id) == 1
+
+
+def test_tenants_repository_get_by_id_uses_identity_map(session, monkeypatch):
+    """Test Tenants repo: a tenant already in the session is fetched without SQL."""
+    tenant_repo = TenantRepository(session)
+    tenant_repo.create(Tenant(name="Alpha", slug="alpha"))
+    tenant = tenant_repo.get_by_slug("alpha")
+
+    def fail_exec(*args, **kwargs):
+        raise AssertionError("get_by_id should not run a query")
+
+    monkeypatch.setattr(session, "exec", fail_exec)
+    monkeypatch.setattr(session, "execute", fail_exec)
+    assert tenant_repo.get_by_id(tenant.id) is tenant
+
+
+def test_tenants_repository_rejects_duplicate_slug(session):
+    """Test Tenants repo: create and update raise DuplicateSlugError on a taken slug."""
+    tenant_repo = TenantRepository(session)
+    tenant_repo.create(Tenant(name="Alpha", slug="alpha"))
+    beta = tenant_repo.create(Tenant(name="Beta", slug="beta"))
+
+    with pytest.raises(DuplicateSlugError):
+        tenant_repo.create(Tenant(name="Alpha Again", slug="alpha"))
+
+    beta.slug = "alpha"
+    with pytest.raises(DuplicateSlugError) as exc_info:
+        tenant_repo.update(beta)
+
+    assert exc_info.value.slug == "alpha"
+    assert tenant_repo.get_by_id(beta.id).slug == "beta"
+    assert [t.slug for t in tenant_repo.list_all()] == ["alpha", "beta"]
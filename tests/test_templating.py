@@ -0,0 +1,29 @@
+"""Tests for the shared template environment."""
+
+from app.config import settings
+from app.utils.templating import templates, warm_templates
+
+
+def test_warm_templates_compiles_every_page():
+    """Test that warming loads each HTML template into the environment cache."""
+    loaded = warm_templates(templates)
+
+    assert loaded == len(templates.env.list_templates(extensions=["html"]))
+    assert loaded > 0
+    assert len(templates.env.cache) >= loaded
+
+
+def test_shared_environment_escapes_and_keeps_compiled_templates():
+    """Test the shared environment autoescapes and never evicts templates."""
+    rendered = templates.env.from_string("{{ value }}").render(value="<b>")
+
+    assert rendered == "&lt;b&gt;"
+    # An unbounded Jinja cache is a plain dict rather than an LRUCache
+    assert isinstance(templates.env.cache, dict)
+
+
+def test_settings_available_to_templates_as_config():
+    """Test templates read settings without routes passing them in."""
+    rendered = templates.env.from_string("{{ config.service_base_url }}").render()
+
+    assert rendered == settings.service_base_url
@@ -0,0 +1,88 @@
+"""Tests for the in-process TTL cache."""
+
+import threading
+from unittest.mock import patch
+
+from app.utils.cache import TTLCache
+
+
+def test_cache_returns_value_within_ttl():
+    """Test that values are served until the TTL elapses."""
+    cache = TTLCache(ttl_seconds=30)
+    with patch("app.utils.cache.time.monotonic", return_value=100.0):
+        cache.set("key", ["a"])
+    with patch("app.utils.cache.time.monotonic", return_value=129.0):
+        assert cache.get("key") == ["a"]
+    with patch("app.utils.cache.time.monotonic", return_value=130.0):
+        assert cache.get("key") is None
+
+
+def test_cache_invalidate():
+    """Test that invalidate drops a single key or everything."""
+    cache = TTLCache(ttl_seconds=30)
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    cache.invalidate("a")
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+
+    cache.invalidate()
+    assert cache.get("b") is None
+
+
+def test_tenant_create_invalidates_navbar_cache(client):
+    """Test that creating a tenant shows it in the navbar immediately."""
+    client.get("/tenants")
+    client.post("/tenants/add", data={"name": "Fresh Tenant", "slug": "fresh"})
+
+    response = client.get("/")
+    assert "Fresh Tenant" in response.text
+
+
+def test_cache_evicts_oldest_when_full():
+    """Test that a bounded cache evicts the oldest entry."""
+    cache = TTLCache(ttl_seconds=30, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("c", 3)
+
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    assert cache.get("c") == 3
+
+
+def test_external_agent_writes_invalidate_buyer_page_cache(client):
+    """Test that the cached buyer page picks up external agent changes."""
+    client.get("/buyer")
+    client.post(
+        "/external-agents/add",
+        data={"name": "Fresh Agent", "base_url": "https://fresh.example.com/mcp"},
+    )
+
+    response = client.get("/buyer")
+    assert "Fresh Agent" in response.text
+
+
+def test_cache_expiry_is_safe_across_threads():
+    """Test that threads racing on one expired entry all see a miss."""
+    cache = TTLCache(ttl_seconds=0)
+    errors = []
+    start = threading.Barrier(8)
+
+    def read_expired():
+        start.wait()
+        try:
+            for _ in range(200):
+                cache.set("key", 1)
+                cache.get("key")
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=read_expired) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []